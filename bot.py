@@ -20,6 +20,7 @@ Version: 1.0.0
 
 import asyncio
 import logging
+import re
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, BotCommand
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters, ContextTypes
 from telegram.constants import ParseMode
@@ -34,6 +35,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Potential SQL injection patterns, fused into one precompiled alternation (one scan per input)
+_SQL_INJECTION_PATTERNS = [
+    r"(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|UNION|SCRIPT)\b)",
+    r"(--|#|\/\*|\*\/)",
+    r"(\b(OR|AND)\s+\d+\s*=\s*\d+)",
+    r"(\b(OR|AND)\s+'.*'\s*=\s*'.*')",
+    r"(\bUNION\s+SELECT\b)",
+    r"(\bDROP\s+TABLE\b)",
+    r"(\bINSERT\s+INTO\b)",
+    r"(\bDELETE\s+FROM\b)"
+]
+_SQL_INJECTION_RE = re.compile("|".join(f"(?:{pattern})" for pattern in _SQL_INJECTION_PATTERNS), re.IGNORECASE)
+
 class TgcfBot:
     def escape_markdown(self, text):
         """Escape special Markdown characters"""
@@ -64,13 +78,12 @@ class TgcfBot:
 
     def __init__(self):
         self.db = Database()
+        self.db.run_maintenance()  # Once per process; other Database() instances skip it
         self.bump_service = None  # Will be initialized after bot is created
         self.user_sessions = {}  # Store user session data
     
     def validate_input(self, text: str, max_length: int = 1000, allowed_chars: str = None) -> tuple[bool, str]:
         """Validate user input with length and character restrictions"""
-        import re  # Import at the top of the function
-        
         if not text or not isinstance(text, str):
             return False, "Input cannot be empty"
         
@@ -82,20 +95,8 @@ class TgcfBot:
                 return False, f"Input contains invalid characters. Only {allowed_chars} allowed"
         
         # Check for potential SQL injection patterns
-        sql_patterns = [
-            r"(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|UNION|SCRIPT)\b)",
-            r"(--|#|\/\*|\*\/)",
-            r"(\b(OR|AND)\s+\d+\s*=\s*\d+)",
-            r"(\b(OR|AND)\s+'.*'\s*=\s*'.*')",
-            r"(\bUNION\s+SELECT\b)",
-            r"(\bDROP\s+TABLE\b)",
-            r"(\bINSERT\s+INTO\b)",
-            r"(\bDELETE\s+FROM\b)"
-        ]
-        
-        for pattern in sql_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return False, "Input contains potentially malicious content"
+        if _SQL_INJECTION_RE.search(text):
+            return False, "Input contains potentially malicious content"
         
         return True, ""
     
@@ -567,10 +568,9 @@ class TgcfBot:
     async def show_config_details(self, query, config_id):
         """Show detailed configuration"""
         user_id = query.from_user.id
-        configs = self.db.get_user_configs(user_id)
-        config = next((c for c in configs if c['id'] == config_id), None)
+        config = self.db.get_config(config_id)
         
-        if not config:
+        if not config or config['user_id'] != user_id:
             await query.answer("Configuration not found!", show_alert=True)
             return
         
@@ -605,7 +605,7 @@ class TgcfBot:
         user_id = query.from_user.id
         
         # Check if user has any accounts
-        accounts = self.db.get_user_accounts(user_id)
+        accounts = self.db.list_user_accounts(user_id)
         if not accounts:
             keyboard = [
                 [InlineKeyboardButton("➕ Add New Account", callback_data="add_account")],
@@ -2738,7 +2738,7 @@ Buttons will appear as an inline keyboard below your ad message.
                 session['step'] = 'account_selection'
                 
                 # Show account selection
-                accounts = self.db.get_user_accounts(user_id)
+                accounts = self.db.list_user_accounts(user_id)
                 keyboard = []
                 for account in accounts:
                     keyboard.append([InlineKeyboardButton(
@@ -2806,7 +2806,7 @@ Buttons will appear as an inline keyboard below your ad message.
                 }
                 
                 # Get the first available account for this user
-                accounts = self.db.get_user_accounts(user_id)
+                accounts = self.db.list_user_accounts(user_id)
                 if not accounts:
                     await update.message.reply_text(
                         "❌ **No accounts found!**\n\nPlease add a Telegram account first before creating forwarding configurations.",
@@ -2859,7 +2859,7 @@ Buttons will appear as an inline keyboard below your ad message.
     async def show_manage_accounts(self, query):
         """Show account management interface"""
         user_id = query.from_user.id
-        accounts = self.db.get_user_accounts(user_id)
+        accounts = self.db.list_user_accounts(user_id)
         
         if not accounts:
             keyboard = [
@@ -3045,6 +3045,7 @@ Buttons will appear as an inline keyboard below your ad message.
         
         # Delete the account and all related data
         self.db.delete_account(account_id)
+        self.bump_service.invalidate_account(account_id)
         
         # Clean up any session files
         import os
@@ -3655,7 +3656,7 @@ Automatically post your advertisements to multiple chats at scheduled times!
         user_id = query.from_user.id
         
         # Check if user has any accounts
-        accounts = self.db.get_user_accounts(user_id)
+        accounts = self.db.list_user_accounts(user_id)
         if not accounts:
             keyboard = [
                 [InlineKeyboardButton("➕ Add New Account", callback_data="add_account")],
@@ -3772,7 +3773,7 @@ This name will help you identify the campaign in your dashboard.
             session['step'] = 'account_selection'
             
             # Show account selection
-            accounts = self.db.get_user_accounts(user_id)
+            accounts = self.db.list_user_accounts(user_id)
             keyboard = []
             for account in accounts:
                 keyboard.append([InlineKeyboardButton(
@@ -20,45 +20,58 @@ Version: 1.0.0
 """
 
 import asyncio
+import concurrent.futures
+import functools
+import heapq
+import io
+import itertools
 import logging
 import schedule
+import sqlite3
 import time
 import os
 import random
 import queue
+import re
 import psutil  # For resource monitoring
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator
 from dataclasses import dataclass
 from telethon import TelegramClient
-from telethon.tl.custom import Button
-from telethon.tl.types import ReplyKeyboardMarkup, KeyboardButton, KeyboardButtonUrl, KeyboardButtonRow
+from telethon.tl.types import ReplyKeyboardMarkup, KeyboardButton
 from telethon import errors
 from telethon.errors import FloodWaitError
-from database import Database
-from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
-from telethon_manager import telethon_manager
+from database import Database, _json_dumps, _json_loads
+from telethon_manager import telethon_manager, _ENTITY_CTORS
 import json
 import threading
 import traceback
+import weakref
 
 # Configure structured logging
 logger = logging.getLogger(__name__)
 
 class StructuredLogger:
-    """Enhanced logging with structured data and context"""
+    """Enhanced logging with structured data and context
+
+    Context dicts are only built when the target level is enabled; the log
+    formatter's %(asctime)s supplies the timestamp.
+    """
     
     @staticmethod
     def log_operation(operation: str, user_id: int = None, campaign_id: int = None, 
                      account_id: int = None, success: bool = None, details: str = None):
         """Log operation with structured context"""
+        level = logging.ERROR if success is False else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
         context = {
             'operation': operation,
             'user_id': user_id,
             'campaign_id': campaign_id,
             'account_id': account_id,
             'success': success,
-            'timestamp': datetime.now().isoformat(),
             'details': details
         }
         
@@ -73,6 +86,8 @@ class StructuredLogger:
     def log_error(operation: str, error: Exception, user_id: int = None, 
                  campaign_id: int = None, account_id: int = None):
         """Log error with full context and stack trace"""
+        if not logger.isEnabledFor(logging.ERROR):
+            return
         context = {
             'operation': operation,
             'user_id': user_id,
@@ -80,22 +95,23 @@ class StructuredLogger:
             'account_id': account_id,
             'error_type': type(error).__name__,
             'error_message': str(error),
-            'timestamp': datetime.now().isoformat(),
-            'stack_trace': traceback.format_exc()
         }
         
+        # exc_info=True lets the handler render the stack trace itself
         logger.error(f"💥 {operation} failed: {error}", extra=context, exc_info=True)
     
     @staticmethod
     def log_performance(operation: str, duration: float, user_id: int = None, 
                        campaign_id: int = None, details: str = None):
         """Log performance metrics"""
+        level = logging.WARNING if duration > 10 else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
         context = {
             'operation': operation,
             'duration_seconds': duration,
             'user_id': user_id,
             'campaign_id': campaign_id,
-            'timestamp': datetime.now().isoformat(),
             'details': details
         }
         
@@ -104,6 +120,230 @@ class StructuredLogger:
         else:
             logger.info(f"⏱️ {operation} completed in {duration:.2f}s", extra=context)
 
+# Default button backfilled into legacy campaigns (serialized once at import)
+_DEFAULT_BUTTONS_JSON = _json_dumps([{"text": "Shop Now", "url": "https://t.me/testukassdfdds"}])
+
+def _maybe_json(raw, default):
+    """Decode a column that may hold JSON or a legacy plain string.
+
+    Only strings starting with '[' or '{' are handed to the JSON parser, so plain
+    strings never pay for a raised-and-caught decode error. A bracket-prefixed
+    string that is not valid JSON (e.g. "[SALE] Buy now!") is returned as-is.
+    """
+    if not raw:
+        return default
+    if isinstance(raw, (list, dict)):
+        return raw
+    s = raw if isinstance(raw, str) else str(raw)
+    if s[0] in '[{':
+        try:
+            return _json_loads(s)
+        except ValueError:
+            return s
+    return s
+
+# Hot campaign reads share one SQL text each, so sqlite3's per-connection
+# statement cache reuses the compiled statement instead of re-preparing it
+_GET_CAMPAIGN_SQL = '''
+    SELECT ac.id, ac.user_id, ac.account_id, ac.campaign_name, ac.ad_content, 
+           ac.target_chats, ac.schedule_type, ac.schedule_time, ac.buttons, 
+           ac.target_mode, ac.is_active, ac.immediate_start, ac.created_at, ac.last_run, 
+           ac.total_sends, ta.account_name
+    FROM ad_campaigns ac
+    LEFT JOIN telegram_accounts ta ON ac.account_id = ta.id
+    WHERE ac.id = ?
+'''
+
+_ACTIVE_CAMPAIGNS_SQL = '''
+    SELECT ac.id, ac.user_id, ac.account_id, ac.campaign_name, ac.ad_content, 
+           ac.target_chats, ac.schedule_type, ac.schedule_time, ac.buttons, 
+           ac.target_mode, ac.is_active, ac.immediate_start, ac.created_at, ac.last_run, 
+           ac.total_sends, ta.account_name
+    FROM ad_campaigns ac
+    LEFT JOIN telegram_accounts ta ON ac.account_id = ta.id
+    WHERE ac.is_active = 1
+    ORDER BY ac.id
+'''
+
+_USER_CAMPAIGNS_SQL = '''
+    SELECT ac.id, ac.user_id, ac.account_id, ac.campaign_name, ac.ad_content, 
+           ac.target_chats, ac.schedule_type, ac.schedule_time, ac.buttons, 
+           ac.target_mode, ac.is_active, ac.created_at, ac.last_run, 
+           ac.total_sends, ta.account_name
+    FROM ad_campaigns ac
+    LEFT JOIN telegram_accounts ta ON ac.account_id = ta.id
+    WHERE ac.user_id = ?
+    ORDER BY ac.created_at DESC
+'''
+
+def _json_if_container(value):
+    """Serialize lists/dicts for a TEXT column; strings are stored as-is"""
+    return _json_dumps(value) if isinstance(value, (dict, list)) else value
+
+def _as_is(value):
+    return value
+
+# update_campaign whitelist: column -> (accepted types, value preparation)
+_CAMPAIGN_FIELD_SPEC = {
+    'campaign_name': (str, _as_is),
+    'ad_content': ((str, dict, list), _json_if_container),
+    'target_chats': ((str, list), _json_if_container),
+    'buttons': ((str, list), _json_if_container),
+    'schedule_type': (str, _as_is),
+    'schedule_time': (str, _as_is),
+    'is_active': (bool, _as_is),
+    'additional_accounts': ((str, list), _json_if_container),
+    'content_variations': ((str, list), _json_if_container),
+    'spam_avoidance_enabled': (bool, _as_is),
+    'timing_variation_minutes': (int, _as_is),
+}
+
+_INSERT_PERF_SQL = '''
+    INSERT INTO ad_performance 
+    (campaign_id, user_id, target_chat, message_id, status)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+_UPDATE_CAMPAIGN_STATS_SQL = '''
+    UPDATE ad_campaigns 
+    SET last_run = CURRENT_TIMESTAMP, total_sends = total_sends + ?
+    WHERE id = ?
+'''
+
+@functools.lru_cache(maxsize=512)
+def _parse_campaign_blob(ad_content_raw, target_chats_raw, buttons_raw, target_mode_raw):
+    """Parse the JSON columns of an ad_campaigns row.
+
+    Keyed by the raw column values, so an UPDATE naturally misses the cache.
+    The parsed objects are shared between callers and must be treated as read-only.
+    """
+    # ad_content may be JSON (forwarded/linked message) or a plain text ad
+    ad_content = _maybe_json(ad_content_raw, "")
+    if not isinstance(ad_content, (list, dict)):
+        ad_content = str(ad_content) if ad_content else ""
+    
+    # target_chats is a JSON list; a bare legacy value becomes a one-element list
+    target_chats = _maybe_json(target_chats_raw, [])
+    if not isinstance(target_chats, list):
+        target_chats = [str(target_chats)] if target_chats else []
+    
+    buttons = _maybe_json(buttons_raw, [])
+    if not isinstance(buttons, list):
+        buttons = []
+    
+    target_mode = str(target_mode_raw) if target_mode_raw else 'specific'
+    return ad_content, target_chats, buttons, target_mode
+
+@functools.lru_cache(maxsize=256)
+def _convert_entities_cached(text_length: int, entity_key: tuple) -> tuple:
+    """Build Telethon entities from (type, offset, length, custom_emoji_id, url) tuples"""
+    telethon_entities = []
+    
+    for entity_type, offset, length, custom_emoji_id, url in entity_key:
+        # Skip if offset/length would be out of bounds
+        if offset + length > text_length:
+            continue
+        
+        ctor = _ENTITY_CTORS.get(entity_type)
+        if ctor is None:
+            continue
+        telethon_entity = ctor(offset, length, custom_emoji_id, url)
+        if telethon_entity is not None:
+            telethon_entities.append(telethon_entity)
+    
+    logger.info(f"Converted {len(telethon_entities)} entities for Telethon")
+    return tuple(telethon_entities)
+
+def _row_to_campaign(row: sqlite3.Row) -> Dict:
+    """Build the campaign dict returned by get_campaign / get_user_campaigns"""
+    ad_content, target_chats, buttons, target_mode = _parse_campaign_blob(
+        row['ad_content'], row['target_chats'], row['buttons'], row['target_mode']
+    )
+    campaign = {
+        'id': row['id'],
+        'user_id': row['user_id'],
+        'account_id': row['account_id'],
+        'campaign_name': row['campaign_name'],
+        'ad_content': ad_content,
+        'target_chats': target_chats,
+        'schedule_type': row['schedule_type'],
+        'schedule_time': row['schedule_time'],
+        'buttons': buttons,
+        'target_mode': target_mode,
+        'is_active': bool(row['is_active']),
+        'created_at': row['created_at'],
+        'last_run': row['last_run'],
+        'total_sends': row['total_sends'] or 0,
+        'account_name': row['account_name']
+    }
+    if 'immediate_start' in row.keys():
+        campaign['immediate_start'] = bool(row['immediate_start'])
+    return campaign
+
+@functools.lru_cache(maxsize=128)
+def _reply_markup_for_buttons(button_texts: tuple):
+    """Build (once per distinct button set) the persistent ReplyKeyboardMarkup for worker sends"""
+    if not button_texts:
+        return None
+    try:
+        # Create button rows for ReplyKeyboardMarkup with text buttons
+        button_rows = [[KeyboardButton(text=text)] for text in button_texts]
+        for text in button_texts:
+            logger.info(f"✅ Created ReplyKeyboard button: '{text}'")
+        
+        # Create ReplyKeyboardMarkup (persistent bottom keyboard)
+        telethon_reply_markup = ReplyKeyboardMarkup(
+            rows=button_rows,
+            resize=True,        # Makes buttons large and full-width
+            persistent=True,    # Stays visible for ALL messages
+            selective=False     # Shows to everyone in group
+        )
+        logger.info(f"🔘 Created ReplyKeyboardMarkup with {len(button_rows)} URL button rows")
+        return telethon_reply_markup
+    except Exception as e:
+        logger.error(f"❌ ReplyKeyboardMarkup creation failed: {e}")
+        return None
+
+@dataclass(frozen=True)
+class ScheduleTrigger:
+    """Compiled form of a campaign's schedule_type/schedule_time"""
+    unit: str                 # 'day', 'hours', 'minutes' or a weekday name ('monday', ...)
+    interval: int = 1
+    at: Optional[str] = None  # "HH:MM" for daily/weekly schedules
+
+# Custom interval such as "every 3 minutes", "4 hours", "every hour"
+_CUSTOM_INTERVAL_RE = re.compile(r'(?:(\d+)\s*)?(minute|hour)', re.IGNORECASE)
+_CUSTOM_UNIT_DEFAULTS = {'minute': ('minutes', 10), 'hour': ('hours', 1)}
+
+@functools.lru_cache(maxsize=256)
+def _compile_schedule(schedule_type: str, schedule_time: str) -> Optional[ScheduleTrigger]:
+    """Parse a schedule definition once; returns None for unknown custom formats"""
+    if schedule_type == 'daily':
+        return ScheduleTrigger('day', at=schedule_time)
+    if schedule_type == 'weekly':
+        # Assuming format like "Monday 14:30"
+        day, time_str = schedule_time.split(' ')
+        return ScheduleTrigger(day.lower(), at=time_str)
+    if schedule_type == 'hourly':
+        return ScheduleTrigger('hours')
+    if schedule_type == 'custom':
+        # Parse custom interval (e.g., "every 3 minutes", "every 4 hours", "15")
+        match = _CUSTOM_INTERVAL_RE.search(schedule_time)
+        if match:
+            unit, default_interval = _CUSTOM_UNIT_DEFAULTS[match.group(2).lower()]
+            return ScheduleTrigger(unit, int(match.group(1)) if match.group(1) else default_interval)
+        if schedule_time.isdigit():
+            # If just a number, assume minutes
+            return ScheduleTrigger('minutes', int(schedule_time))
+    return None
+
+@dataclass
+class CampaignContext:
+    """Per-run campaign data parsed once and shared by every target send"""
+    ad_content: Any
+    buttons: List[Dict]
+    telethon_reply_markup: Optional[ReplyKeyboardMarkup]
+
 @dataclass
 class AdCampaign:
     """Represents an advertising campaign"""
@@ -126,10 +366,20 @@ class BumpService:
     def __init__(self, bot_instance=None):
         self.db = Database()
         self.active_campaigns = {}
+        self._jobs_by_campaign = defaultdict(list)  # campaign_id -> schedule.Job objects
+        self._active_job_count = 0  # Mirrors the size of _jobs_by_campaign for status logging
+        self._scheduler_wakeup = threading.Event()  # Set when jobs change so the scheduler re-computes its sleep
+        self._delayed_fires = []  # Heap of (due_time, seq, callback, campaign_id) drained by the scheduler thread
+        self._delayed_fires_lock = threading.Lock()
+        self._delayed_fire_seq = itertools.count()
+        self._inflight_campaigns = set()  # Campaigns queued or running (max one instance each)
+        self._inflight_lock = threading.Lock()
         self.scheduler_thread = None
         self.is_running = True  # Set to True so workers can run immediately
-        self.telegram_clients = {}
-        self.client_init_semaphore = threading.Semaphore(1)  # Thread-safe semaphore
+        self.telegram_clients = {}  # account_id -> long-lived client owned by the client loop
+        self._client_locks = defaultdict(asyncio.Lock)  # Per-account init locks (client loop only)
+        self._client_loop = None  # Persistent event loop shared by all cached Telethon clients
+        self._client_loop_lock = threading.Lock()
         self.temp_files = set()  # Track temporary files for cleanup
         self.bot_instance = bot_instance  # Store bot instance for ReplyKeyboardMarkup
         
@@ -137,10 +387,27 @@ class BumpService:
         from config import Config
         self.execution_queue = queue.Queue(maxsize=Config.EXECUTION_QUEUE_SIZE)  # Queue for campaign executions
         self.execution_semaphore = threading.Semaphore(Config.MAX_CONCURRENT_CAMPAIGNS)  # Max concurrent
+        # Bounded pool for manual sends and immediate campaign starts (no thread per fire)
+        self._send_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=Config.EXECUTION_WORKER_THREADS, thread_name_prefix='bump'
+        )
         self.client_last_used = {}  # Track when each client was last used
+        self._client_holders = defaultdict(weakref.WeakSet)  # account_id -> tasks using its client (client loop only)
         self.client_cleanup_interval = Config.CLIENT_IDLE_TIMEOUT  # Close clients idle for X seconds
         self.max_execution_workers = Config.EXECUTION_WORKER_THREADS  # Worker threads
         
+        self._storage_msg_cache = {}  # (account, storage chat, msg) -> (cached_at, message)
+        self._storage_msg_cache_ttl = Config.STORAGE_MESSAGE_CACHE_TTL_SECONDS
+        self._storage_entity_cache = {}  # (account, STORAGE_CHANNEL_ID) -> resolved storage channel entity
+        self._account_cache = {}  # account_id -> (cached_at, account row)
+        self._account_cache_ttl = Config.ACCOUNT_CACHE_TTL_SECONDS
+        self._target_dialog_sweep_min = Config.TARGET_DIALOG_SWEEP_MIN
+        
+        # ad_performance rows buffered per campaign run and written with executemany.
+        # Rows are appended on the client loop but flushed from worker threads too.
+        self._pending_perf = defaultdict(list)
+        self._pending_perf_lock = threading.Lock()
+
         # Start execution worker threads
         self.execution_workers = []
         for i in range(self.max_execution_workers):
@@ -246,7 +513,7 @@ class BumpService:
             
             if Config.DISABLE_DAILY_LIMITS_FOR_MATURE and is_mature:
                 # No daily limits for mature accounts (2023+)
-                logger.debug(f"🛡️ ANTI-BAN: Mature account - daily limits disabled")
+                logger.debug("🛡️ ANTI-BAN: Mature account - daily limits disabled")
             else:
                 # Enforce daily limits for new/warmed accounts
                 if messages_today + messages_to_send > daily_limit:
@@ -521,7 +788,7 @@ class BumpService:
             await asyncio.sleep(typing_duration)
             
         except Exception as e:
-            logger.debug(f"Typing simulation error (non-critical): {e}")
+            logger.debug("Typing simulation error (non-critical): %s", e)
     
     async def _simulate_read_receipts(self, client, account_id: int, target_chat=None):
         """
@@ -554,7 +821,7 @@ class BumpService:
                     )
                     chats_to_read.extend([g.entity for g in random_groups])
             except Exception as e:
-                logger.debug(f"Could not fetch dialogs for reading: {e}")
+                logger.debug("Could not fetch dialogs for reading: %s", e)
             
             # Read messages from selected chats
             for chat in chats_to_read:
@@ -569,21 +836,22 @@ class BumpService:
                     await asyncio.sleep(random.uniform(1, 3))
                     
                 except Exception as e:
-                    logger.debug(f"Read receipt error for {chat}: {e}")
+                    logger.debug("Read receipt error for %s: %s", chat, e)
             
             # Update last online simulation time
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
+            await self._run_db(self._record_online_simulation, account_id)
+            
+        except Exception as e:
+            logger.debug("Read receipt simulation error (non-critical): %s", e)
+    
+    def _record_online_simulation(self, account_id: int):
+        """Stamp the account's last simulated online time"""
+        with self._get_db_connection() as conn:
+            conn.execute("""
                 UPDATE account_usage_tracking 
                 SET last_online_simulation = CURRENT_TIMESTAMP
                 WHERE account_id = ?
             """, (account_id,))
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            logger.debug(f"Read receipt simulation error (non-critical): {e}")
     
     def _handle_peer_flood(self, account_id: int, account_name: str):
         """
@@ -596,21 +864,16 @@ class BumpService:
         logger.error(f"⚠️ This is a PRE-BAN WARNING from Telegram!")
         
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Mark peer flood detected
-            cursor.execute("""
-                UPDATE account_usage_tracking 
-                SET peer_flood_detected = 1,
-                    peer_flood_time = CURRENT_TIMESTAMP,
-                    is_restricted = 1,
-                    restriction_reason = 'PeerFlood - Too many messages'
-                WHERE account_id = ?
-            """, (account_id,))
-            
-            conn.commit()
-            conn.close()
+            with self._get_db_connection() as conn:
+                # Mark peer flood detected
+                conn.execute("""
+                    UPDATE account_usage_tracking 
+                    SET peer_flood_detected = 1,
+                        peer_flood_time = CURRENT_TIMESTAMP,
+                        is_restricted = 1,
+                        restriction_reason = 'PeerFlood - Too many messages'
+                    WHERE account_id = ?
+                """, (account_id,))
             
             # Auto-enable warm-up mode if configured
             if Config.AUTO_ENABLE_WARMUP_ON_PEER_FLOOD:
@@ -630,20 +893,15 @@ class BumpService:
         This helps track which accounts are being rate-limited.
         """
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Update account tracking with flood wait info
-            cursor.execute("""
-                UPDATE account_usage_tracking 
-                SET is_restricted = 1,
-                    restriction_reason = ?,
-                    last_campaign_time = CURRENT_TIMESTAMP
-                WHERE account_id = ?
-            """, (f"FloodWait {wait_seconds}s", account_id))
-            
-            conn.commit()
-            conn.close()
+            with self._get_db_connection() as conn:
+                # Update account tracking with flood wait info
+                conn.execute("""
+                    UPDATE account_usage_tracking 
+                    SET is_restricted = 1,
+                        restriction_reason = ?,
+                        last_campaign_time = CURRENT_TIMESTAMP
+                    WHERE account_id = ?
+                """, (f"FloodWait {wait_seconds}s", account_id))
             
             logger.warning(f"📝 Recorded FloodWait for account {account_id}: {wait_seconds}s cooldown")
             
@@ -659,17 +917,12 @@ class BumpService:
         from datetime import datetime, timedelta
         
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT peer_flood_detected, peer_flood_time
-                FROM account_usage_tracking
-                WHERE account_id = ?
-            """, (account_id,))
-            
-            row = cursor.fetchone()
-            conn.close()
+            with self._get_db_connection() as conn:
+                row = conn.execute("""
+                    SELECT peer_flood_detected, peer_flood_time
+                    FROM account_usage_tracking
+                    WHERE account_id = ?
+                """, (account_id,)).fetchone()
             
             if not row or not row[0]:
                 return False, ""
@@ -685,17 +938,14 @@ class BumpService:
                     return True, f"PeerFlood cooldown active (wait {remaining:.1f} more hours)"
                 else:
                     # Cooldown expired, clear flag
-                    conn = self.get_db_connection()
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        UPDATE account_usage_tracking 
-                        SET peer_flood_detected = 0,
-                            is_restricted = 0,
-                            restriction_reason = NULL
-                        WHERE account_id = ?
-                    """, (account_id,))
-                    conn.commit()
-                    conn.close()
+                    with self._get_db_connection() as conn:
+                        conn.execute("""
+                            UPDATE account_usage_tracking 
+                            SET peer_flood_detected = 0,
+                                is_restricted = 0,
+                                restriction_reason = NULL
+                            WHERE account_id = ?
+                        """, (account_id,))
                     
                     logger.info(f"✅ PeerFlood cooldown expired for account {account_id}")
                     return False, ""
@@ -741,6 +991,7 @@ class BumpService:
                         logger.error(f"❌ {worker_name} failed campaign {campaign_id}: {e}")
                         logger.error(f"Stack trace: {traceback.format_exc()}")
                     finally:
+                        self._release_campaign_slot(campaign_id)
                         self.execution_queue.task_done()
                 
             except Exception as e:
@@ -756,38 +1007,16 @@ class BumpService:
         while self.is_running:
             try:
                 current_time = time.time()
-                clients_to_close = []
                 
-                # Find idle clients
-                with self.client_init_semaphore:
-                    for account_id, last_used in list(self.client_last_used.items()):
-                        if current_time - last_used > self.client_cleanup_interval:
-                            if account_id in self.telegram_clients:
-                                clients_to_close.append(account_id)
-                
-                # Close idle clients
-                for account_id in clients_to_close:
+                # Close idle clients on the loop that owns them (clients held by a running campaign are skipped)
+                if any(current_time - last_used > self.client_cleanup_interval
+                       for last_used in list(self.client_last_used.values())):
                     try:
-                        client = self.telegram_clients.get(account_id)
-                        if client and client.is_connected():
-                            # Run disconnect in async
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            try:
-                                loop.run_until_complete(client.disconnect())
-                            finally:
-                                loop.close()
-                            
-                            # Remove from cache
-                            with self.client_init_semaphore:
-                                if account_id in self.telegram_clients:
-                                    del self.telegram_clients[account_id]
-                                if account_id in self.client_last_used:
-                                    del self.client_last_used[account_id]
-                            
-                            logger.info(f"🧹 Closed idle client for account {account_id} (idle for {self.client_cleanup_interval}s)")
+                        closed = self._run_on_client_loop(self._close_idle_clients(current_time), timeout=15)
+                        if closed:
+                            logger.info(f"🧹 Closed {len(closed)} idle clients (idle for {self.client_cleanup_interval}s)")
                     except Exception as e:
-                        logger.warning(f"⚠️ Error closing idle client {account_id}: {e}")
+                        logger.warning(f"⚠️ Error closing idle clients: {e}")
                 
                 # Log memory usage every cleanup cycle
                 try:
@@ -798,7 +1027,7 @@ class BumpService:
                 except ImportError:
                     logger.debug("psutil not available - resource monitoring disabled")
                 except Exception as e:
-                    logger.debug(f"Resource monitoring error: {e}")
+                    logger.debug("Resource monitoring error: %s", e)
                 
                 # Sleep for cleanup interval
                 time.sleep(60)  # Check every minute
@@ -809,9 +1038,94 @@ class BumpService:
         
         logger.info("🧹 Client cleanup worker stopped")
     
+    def _get_client_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the persistent event loop that owns every cached Telethon client"""
+        with self._client_loop_lock:
+            if self._client_loop is None or self._client_loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=self._run_client_loop, args=(loop,), daemon=True, name="TelethonClientLoop")
+                thread.start()
+                self._client_loop = loop
+                logger.info("✅ Started persistent Telethon client loop")
+            return self._client_loop
+    
+    def _run_client_loop(self, loop: asyncio.AbstractEventLoop):
+        """Thread target running the client loop forever"""
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+    
+    def _run_on_client_loop(self, coro, timeout: float = None):
+        """Run a coroutine on the client loop from any other thread and wait for its result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_client_loop())
+        return future.result(timeout)
+    
+    async def _get_client(self, account_id: int) -> Optional[TelegramClient]:
+        """Return the long-lived client for an account, connecting it on first use"""
+        # The calling task holds the client until it finishes, so idle cleanup cannot
+        # disconnect it between sends, however long the anti-ban delays are
+        self._client_holders[account_id].add(asyncio.current_task())
+        async with self._client_locks[account_id]:
+            client = self.telegram_clients.get(account_id)
+            if client is not None and client.is_connected():
+                self.client_last_used[account_id] = time.time()
+                logger.info(f"♻️ Reusing connected client for account {account_id}")
+                return client
+            
+            self._evict_client(account_id)
+            return await self._async_initialize_client(account_id, cache_client=True)
+    
+    def _evict_client(self, account_id: int):
+        """Forget a cached client so the next _get_client reconnects"""
+        self.telegram_clients.pop(account_id, None)
+        self.client_last_used.pop(account_id, None)
+    
+    async def _disconnect_client(self, account_id: int, client):
+        """Disconnect one client with a 5 second timeout"""
+        try:
+            await asyncio.wait_for(client.disconnect(), timeout=5)
+            logger.info(f"Disconnected client for account {account_id}")
+        except Exception as e:
+            logger.error(f"Error disconnecting client {account_id}: {e}")
+    
+    def _client_in_use(self, account_id: int) -> bool:
+        """True while any task that fetched this account's client is still running"""
+        return any(not task.done() for task in self._client_holders.get(account_id, ()))
+    
+    async def _close_idle_clients(self, now: float) -> List[int]:
+        """Disconnect clients idle past the cleanup interval and not held by a running task (client loop only)"""
+        idle = [
+            account_id for account_id, last_used in list(self.client_last_used.items())
+            if now - last_used > self.client_cleanup_interval
+            and account_id in self.telegram_clients
+            and not self._client_in_use(account_id)
+        ]
+        if idle:
+            await self._disconnect_clients(idle)
+        return idle
+    
+    async def _disconnect_clients(self, account_ids):
+        """Evict and concurrently disconnect the given cached clients (client loop only)"""
+        disconnects = []
+        for account_id in account_ids:
+            client = self.telegram_clients.get(account_id)
+            self._evict_client(account_id)
+            if client is not None:
+                disconnects.append(self._disconnect_client(account_id, client))
+        await asyncio.gather(*disconnects, return_exceptions=True)
+    
     def _get_db_connection(self):
-        """Get database connection with proper configuration"""
-        return self.db._get_connection()
+        """Get this thread's pooled database connection (do not close it)"""
+        conn = self.db._get_connection()
+        conn.row_factory = sqlite3.Row  # Rows support both name and index access
+        return conn
+    
+    async def _run_db(self, func, *args):
+        """Run a blocking database call in the default executor
+        
+        Every campaign shares the client loop, so a query waiting on SQLite's busy
+        timeout must not run on it. Connections are per thread, so this is safe.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
     
     def _register_temp_file(self, file_path: str):
         """Register a temporary file for cleanup"""
@@ -822,14 +1136,105 @@ class BumpService:
         try:
             if os.path.exists(file_path):
                 os.remove(file_path)
-                logger.debug(f"Cleaned up temporary file: {file_path}")
+                logger.debug("Cleaned up temporary file: %s", file_path)
         except Exception as e:
             logger.warning(f"Failed to clean up temporary file {file_path}: {e}")
         finally:
             self.temp_files.discard(file_path)
     
-    async def _process_bridge_channel_message(self, client, chat_entity, ad_content, telethon_reply_markup):
+    async def _get_storage_message(self, client, account_id, storage_chat, storage_message_id):
+        """Fetch a storage-channel message once per TTL instead of once per target"""
+        cache_key = (account_id, getattr(storage_chat, 'id', storage_chat), storage_message_id)
+        cached = self._storage_msg_cache.get(cache_key)
+        if cached and time.time() - cached[0] < self._storage_msg_cache_ttl:
+            return cached[1]
+        message = await client.get_messages(storage_chat, ids=storage_message_id)
+        if message:
+            self._storage_msg_cache[cache_key] = (time.time(), message)
+        return message
+    
+    def _get_account_cached(self, account_id: int) -> Optional[Dict]:
+        """Account row lookup reused across campaign runs for the TTL (misses are not cached)"""
+        cached = self._account_cache.get(account_id)
+        if cached and time.time() - cached[0] < self._account_cache_ttl:
+            return cached[1]
+        account = self.db.get_account(account_id)
+        if account:
+            self._account_cache[account_id] = (time.time(), account)
+        return account
+    
+    def invalidate_account(self, account_id: int):
+        """Forget the cached account row, storage lookups and client after the account is changed or deleted"""
+        self._account_cache.pop(account_id, None)
+        for cache in (self._storage_entity_cache, self._storage_msg_cache):
+            for key in [key for key in list(cache) if key[0] == account_id]:
+                cache.pop(key, None)
+        if account_id in self.telegram_clients:
+            # Fire and forget: disconnecting must happen on the loop that owns the client
+            asyncio.run_coroutine_threadsafe(self._disconnect_clients([account_id]), self._get_client_loop())
+        telethon_manager.invalidate_account(account_id)
+    
+    async def _get_storage_chat_entity(self, client, account_id, storage_chat_id):
+        """Resolve a storage chat once per account instead of one get_entity RPC per target"""
+        cache_key = (account_id, str(storage_chat_id))
+        entity = self._storage_entity_cache.get(cache_key)
+        if entity is None:
+            entity = await client.get_entity(int(storage_chat_id))
+            self._storage_entity_cache[cache_key] = entity
+        return entity
+    
+    async def _resolve_target_entities(self, client, target_chats) -> List:
+        """Resolve target chats from one get_dialogs sweep, falling back to get_entity for misses"""
+        dialog_map = {}
+        # A full sweep only pays off once it replaces several get_entity round trips
+        if len(target_chats) >= self._target_dialog_sweep_min:
+            try:
+                for dialog in await client.get_dialogs():
+                    entity = dialog.entity
+                    # Index by marked id only; bare ids of a user and a channel can collide
+                    dialog_map[dialog.id] = entity
+                    username = getattr(entity, 'username', None)
+                    if username:
+                        dialog_map['@' + username.lower()] = entity
+            except Exception as e:
+                logger.warning(f"⚠️ Could not prefetch dialogs for target resolution: {e}")
+        
+        target_entities = []
+        for chat_id in target_chats:
+            key = str(chat_id).strip()
+            if key.lstrip('-').isdigit():
+                key = int(key)
+            elif not key.startswith('@'):
+                key = '@' + key.lower().rsplit('/', 1)[-1]
+            else:
+                key = key.lower()
+            entity = dialog_map.get(key)
+            if entity is not None:
+                target_entities.append(entity)
+                continue
+            try:
+                target_entities.append(await client.get_entity(chat_id))
+            except Exception as e:
+                logger.error(f"Failed to get entity for {chat_id}: {e}")
+        return target_entities
+    
+    def _build_campaign_context(self, campaign: Dict) -> CampaignContext:
+        """Parse everything target-independent for a campaign run exactly once"""
+        buttons = campaign.get('buttons') or []
+        button_texts = tuple(button['text'] for button in buttons if button.get('text'))
+        if buttons and not button_texts:
+            logger.warning(f"⚠️ No valid URL buttons created")
+        return CampaignContext(
+            ad_content=campaign.get('ad_content'),
+            buttons=buttons,
+            telethon_reply_markup=_reply_markup_for_buttons(button_texts)
+        )
+    
+    async def _process_bridge_channel_message(self, client, chat_entity, campaign_ctx: CampaignContext):
         """Process bridge channel message with premium emoji preservation"""
+        ad_content = campaign_ctx.ad_content
+        telethon_reply_markup = campaign_ctx.telethon_reply_markup
+        
         try:
             bridge_channel_entity = ad_content.get('bridge_channel_entity')
             bridge_message_id = ad_content.get('bridge_message_id')
@@ -867,7 +1272,7 @@ class BumpService:
                 # Step 3: Forward the message with all entities preserved + add buttons
                 if original_message.media:
                     # Forward media with preserved entities and add buttons
-                    message = await client.send_file(
+                    await client.send_file(
                         chat_entity,
                         original_message.media,
                         caption=original_message.message,
@@ -876,7 +1281,7 @@ class BumpService:
                     logger.info(f"✅ Bridge channel media forwarded with PREMIUM EMOJIS and buttons to {chat_entity.title}")
                 else:
                     # Forward text with preserved entities and add buttons
-                    message = await client.send_message(
+                    await client.send_message(
                         chat_entity,
                         original_message.message,
                         reply_markup=telethon_reply_markup
@@ -889,61 +1294,65 @@ class BumpService:
                 
         except Exception as e:
             logger.error(f"❌ Bridge channel processing failed: {e}")
-            return
+    
+    async def cleanup_all_resources_async(self):
+        """Disconnect every cached client concurrently and drop temp/session files (client loop only)
+
+        The client cache is swapped out before any await, so repeated or concurrent
+        calls find nothing left to close. Wall-clock is bounded by the slowest
+        disconnect (5s), not by the number of clients.
+        """
+        clients, self.telegram_clients = self.telegram_clients, {}
+        self.client_last_used.clear()
+        if clients:
+            await asyncio.gather(
+                *(self._disconnect_client(account_id, client) for account_id, client in clients.items()),
+                return_exceptions=True
+            )
+        
+        temp_files, self.temp_files = self.temp_files, set()
+        for temp_file in temp_files:
+            self._cleanup_temp_file(temp_file)
+        
+        self._cleanup_session_files()
     
     def cleanup_all_resources(self):
         """Clean up all resources (clients, temp files, etc.)"""
         logger.info("Starting comprehensive resource cleanup...")
         
-        # Clean up all Telegram clients
-        for account_id, client in list(self.telegram_clients.items()):
+        if self._client_loop is not None and not self._client_loop.is_closed():
             try:
-                if hasattr(client, 'disconnect'):
-                    # Run disconnect in a separate thread to avoid blocking
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                        future = executor.submit(self._sync_disconnect_client, client)
-                        future.result(timeout=5)  # 5 second timeout
-                logger.info(f"Disconnected client for account {account_id}")
+                self._run_on_client_loop(self.cleanup_all_resources_async(), timeout=10)
             except Exception as e:
-                logger.error(f"Error disconnecting client {account_id}: {e}")
-            finally:
-                del self.telegram_clients[account_id]
-        
-        # Clean up all temporary files
-        for temp_file in list(self.temp_files):
-            self._cleanup_temp_file(temp_file)
+                logger.error(f"Error during resource cleanup: {e}")
+        else:
+            # No client loop was ever started, so there are no clients to disconnect
+            temp_files, self.temp_files = self.temp_files, set()
+            for temp_file in temp_files:
+                self._cleanup_temp_file(temp_file)
+            self._cleanup_session_files()
         
-        # Clean up any remaining session files
-        self._cleanup_session_files()
+        # Background manual sends are not awaited at shutdown
+        self._send_executor.shutdown(wait=False)
         
         logger.info("Resource cleanup completed")
     
-    def _sync_disconnect_client(self, client):
-        """Synchronously disconnect a client"""
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(client.disconnect())
-            finally:
-                loop.close()
-        except Exception as e:
-            logger.error(f"Failed to disconnect client: {e}")
-    
     def _cleanup_session_files(self):
         """Clean up all session files"""
-        import glob
         try:
-            # Find all session files
-            session_files = glob.glob("bump_session_*.session")
-            for session_file in session_files:
-                try:
-                    if os.path.exists(session_file):
-                        os.remove(session_file)
-                        logger.debug(f"Cleaned up session file: {session_file}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up session file {session_file}: {e}")
+            # Single directory pass; unlink directly instead of glob + exists + remove
+            with os.scandir('.') as it:
+                for entry in it:
+                    name = entry.name
+                    if not (name.startswith('bump_session_') and name.endswith('.session')):
+                        continue
+                    try:
+                        os.unlink(entry.path)
+                        logger.debug("Cleaned up session file: %s", name)
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        logger.warning(f"Failed to clean up session file {name}: {e}")
         except Exception as e:
             logger.error(f"Error during session file cleanup: {e}")
     
@@ -956,40 +1365,36 @@ class BumpService:
         
         logger.info(f"Reconstructing text with {len(entities)} entities")
         
-        # Sort entities by offset to process them in order
-        sorted_entities = sorted(entities, key=lambda x: x.get('offset', 0))
+        # Telegram delivers entities sorted by offset; only sort when they are not
+        offsets = [entity.get('offset', 0) for entity in entities]
+        if any(a > b for a, b in zip(offsets, offsets[1:])):
+            entities = sorted(entities, key=lambda x: x.get('offset', 0))
         
-        reconstructed = ""
+        buf = io.StringIO()
         last_offset = 0
         
-        for entity in sorted_entities:
-            entity_type = entity.get('type', '')
+        for entity in entities:
             offset = entity.get('offset', 0)
             length = entity.get('length', 0)
             
             # Add text before this entity
             if offset > last_offset:
-                reconstructed += text[last_offset:offset]
+                buf.write(text[last_offset:offset])
             
-            # Get the entity text
+            # Entity text is kept as-is (custom emojis keep their fallback emoji text)
             entity_text = text[offset:offset + length]
+            buf.write(entity_text)
             
-            if entity_type == 'custom_emoji' and entity.get('custom_emoji_id'):
-                # For custom emojis, we'll use a special format that Telethon can understand
-                custom_emoji_id = entity.get('custom_emoji_id')
-                # Use the original text but mark it for custom emoji
-                reconstructed += entity_text  # Keep original emoji text
-                logger.info(f"Preserved custom emoji: {entity_text} (ID: {custom_emoji_id})")
-            else:
-                # For other entities, just add the text
-                reconstructed += entity_text
+            if entity.get('type') == 'custom_emoji' and entity.get('custom_emoji_id'):
+                logger.debug("Preserved custom emoji: %s (ID: %s)", entity_text, entity.get('custom_emoji_id'))
             
             last_offset = offset + length
         
         # Add remaining text
         if last_offset < len(text):
-            reconstructed += text[last_offset:]
+            buf.write(text[last_offset:])
         
+        reconstructed = buf.getvalue()
         logger.info(f"Text reconstruction complete: {len(reconstructed)} chars")
         return reconstructed
     
@@ -999,49 +1404,14 @@ class BumpService:
             return []
         
         try:
-            from telethon.tl.types import (
-                MessageEntityCustomEmoji, MessageEntityBold, MessageEntityItalic,
-                MessageEntityTextUrl, MessageEntityHashtag
+            # Conversion only depends on the entity fields and the text length, so the
+            # same campaign content maps to the same (immutable) Telethon entities
+            entity_key = tuple(
+                (entity.get('type', ''), entity.get('offset', 0), entity.get('length', 0),
+                 entity.get('custom_emoji_id'), entity.get('url'))
+                for entity in entities
             )
-            
-            telethon_entities = []
-            
-            for entity in entities:
-                entity_type = entity.get('type', '')
-                offset = entity.get('offset', 0)
-                length = entity.get('length', 0)
-                
-                # Skip if offset/length would be out of bounds
-                if offset + length > len(text):
-                    continue
-                
-                if entity_type == 'custom_emoji' and entity.get('custom_emoji_id'):
-                    # This is the key for premium emojis!
-                    custom_emoji_id = int(entity.get('custom_emoji_id'))
-                    telethon_entity = MessageEntityCustomEmoji(
-                        offset=offset,
-                        length=length,
-                        document_id=custom_emoji_id
-                    )
-                    telethon_entities.append(telethon_entity)
-                    # Custom emoji converted successfully
-                
-                elif entity_type == 'bold':
-                    telethon_entities.append(MessageEntityBold(offset=offset, length=length))
-                
-                elif entity_type == 'italic':
-                    telethon_entities.append(MessageEntityItalic(offset=offset, length=length))
-                
-                elif entity_type == 'text_link' and entity.get('url'):
-                    telethon_entities.append(MessageEntityTextUrl(
-                        offset=offset, length=length, url=entity.get('url')
-                    ))
-                
-                elif entity_type == 'hashtag':
-                    telethon_entities.append(MessageEntityHashtag(offset=offset, length=length))
-            
-            logger.info(f"Converted {len(telethon_entities)} entities for Telethon")
-            return telethon_entities
+            return list(_convert_entities_cached(len(text), entity_key))
             
         except Exception as e:
             logger.error(f"Failed to convert entities to Telethon format: {e}")
@@ -1051,7 +1421,6 @@ class BumpService:
     
     def init_bump_database(self):
         """Initialize bump service database tables"""
-        import sqlite3
         
         with self._get_db_connection() as conn:
             cursor = conn.cursor()
@@ -1166,13 +1535,19 @@ class BumpService:
                 cursor.execute('ALTER TABLE ad_campaigns ADD COLUMN content_variations TEXT')
                 logger.info("Added content_variations column to ad_campaigns table")
             
-            # Update existing campaigns with default values and ensure they're active
-            cursor.execute("UPDATE ad_campaigns SET buttons = ? WHERE buttons IS NULL", (json.dumps([{"text": "Shop Now", "url": "https://t.me/testukassdfdds"}]),))
-            cursor.execute("UPDATE ad_campaigns SET target_mode = 'all_groups' WHERE target_mode IS NULL")
-            cursor.execute("UPDATE ad_campaigns SET immediate_start = 0 WHERE immediate_start IS NULL")
-            cursor.execute("UPDATE ad_campaigns SET is_active = 1 WHERE is_active IS NULL OR is_active = 0")
-            cursor.execute("UPDATE ad_campaigns SET spam_avoidance_enabled = 1 WHERE spam_avoidance_enabled IS NULL")
-            cursor.execute("UPDATE ad_campaigns SET timing_variation_minutes = 5 WHERE timing_variation_minutes IS NULL")
+            # Backfill default values and ensure campaigns are active (single table pass)
+            cursor.execute('''
+                UPDATE ad_campaigns SET
+                    buttons = COALESCE(buttons, ?),
+                    target_mode = COALESCE(target_mode, 'all_groups'),
+                    immediate_start = COALESCE(immediate_start, 0),
+                    is_active = 1,
+                    spam_avoidance_enabled = COALESCE(spam_avoidance_enabled, 1),
+                    timing_variation_minutes = COALESCE(timing_variation_minutes, 5)
+                WHERE buttons IS NULL OR target_mode IS NULL OR immediate_start IS NULL
+                   OR is_active IS NULL OR is_active = 0
+                   OR spam_avoidance_enabled IS NULL OR timing_variation_minutes IS NULL
+            ''', (_DEFAULT_BUTTONS_JSON,))
             
             updated_count = cursor.rowcount
             if updated_count > 0:
@@ -1193,13 +1568,17 @@ class BumpService:
                 )
             ''')
             
+            # Indexes for the per-user campaign list, per-account lookups and per-campaign stats
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_campaigns_user_active_created ON ad_campaigns(user_id, is_active, created_at DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_campaigns_account ON ad_campaigns(account_id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_perf_campaign ON ad_performance(campaign_id, sent_at DESC)')
+            
             conn.commit()
     
     def add_campaign(self, user_id: int, account_id: int, campaign_name: str, 
                     ad_content, target_chats: List[str], schedule_type: str, 
                     schedule_time: str, buttons=None, target_mode='specific', immediate_start=False) -> int:
         """Add new ad campaign with support for complex content types and buttons"""
-        import sqlite3
         start_time = time.time()
         
         try:
@@ -1214,15 +1593,15 @@ class BumpService:
             
             # Convert ad_content to JSON string if it's a list or dict
             if isinstance(ad_content, (list, dict)):
-                ad_content_str = json.dumps(ad_content)
+                ad_content_str = _json_dumps(ad_content)
             else:
                 ad_content_str = str(ad_content)
             
             # Convert target_chats to JSON string
-            target_chats_str = json.dumps(target_chats) if isinstance(target_chats, list) else str(target_chats)
+            target_chats_str = _json_dumps(target_chats) if isinstance(target_chats, list) else str(target_chats)
             
             # Convert buttons to JSON string
-            buttons_str = json.dumps(buttons) if buttons else None
+            buttons_str = _json_dumps(buttons) if buttons else None
             
             with self._get_db_connection() as conn:
                 cursor = conn.cursor()
@@ -1259,12 +1638,8 @@ class BumpService:
                 # Execute immediately if requested
                 if immediate_start:
                     logger.info(f"🚀 Running campaign {campaign_id} immediately on creation")
-                    # Run the campaign execution in a separate thread to not block
-                    threading.Thread(
-                        target=self._run_campaign_immediately, 
-                        args=(campaign_id,),
-                        daemon=True
-                    ).start()
+                    # Run the campaign execution on the shared pool to not block
+                    self._send_executor.submit(self._run_campaign_immediately, campaign_id)
                 
                 return campaign_id
                 
@@ -1282,15 +1657,8 @@ class BumpService:
         """Run campaign immediately in a separate thread"""
         try:
             logger.info(f"🚀 Starting immediate execution of campaign {campaign_id}")
-            # Create new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                # Run the campaign execution
-                loop.run_until_complete(self._execute_campaign_async(campaign_id))
-            finally:
-                loop.close()
+            # Run on the client loop so the account's cached client can be reused
+            self._run_on_client_loop(self._execute_campaign_async(campaign_id))
                 
         except Exception as e:
             logger.error(f"❌ Immediate campaign execution failed for {campaign_id}: {e}")
@@ -1299,7 +1667,7 @@ class BumpService:
         """Execute campaign asynchronously - same logic as scheduled execution"""
         try:
             # Get campaign data
-            campaign = self.db.get_campaign(campaign_id)
+            campaign = await self._run_db(self.db.get_campaign, campaign_id)
             if not campaign:
                 logger.error(f"Campaign {campaign_id} not found")
                 return
@@ -1313,197 +1681,50 @@ class BumpService:
             
         except Exception as e:
             logger.error(f"❌ Immediate campaign execution failed for {campaign_id}: {e}")
+        finally:
+            # Persist rows buffered by a run that ended early
+            await self._run_db(self._flush_ad_performance, campaign_id)
     
     def get_user_campaigns(self, user_id: int) -> List[Dict]:
         """Get all campaigns for a user"""
-        import sqlite3
-        
+        return list(self.iter_user_campaigns(user_id))
+    
+    def iter_user_campaigns(self, user_id: int, batch_size: int = 100) -> Iterator[Dict]:
+        """Yield a user's campaigns newest first, fetching rows in batches"""
         with self._get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT ac.id, ac.user_id, ac.account_id, ac.campaign_name, ac.ad_content, 
-                       ac.target_chats, ac.schedule_type, ac.schedule_time, ac.buttons, 
-                       ac.target_mode, ac.is_active, ac.created_at, ac.last_run, 
-                       ac.total_sends, ta.account_name
-                FROM ad_campaigns ac
-                LEFT JOIN telegram_accounts ta ON ac.account_id = ta.id
-                WHERE ac.user_id = ?
-                ORDER BY ac.created_at DESC
-            ''', (user_id,))
-            rows = cursor.fetchall()
-            
-            campaigns = []
-            for row in rows:
-                # Parse ad_content (could be JSON string or plain string) - safer parsing
-                try:
-                    if row[4] and isinstance(row[4], str) and row[4].startswith(('[', '{')):
-                        ad_content = json.loads(row[4])
-                    else:
-                        ad_content = str(row[4]) if row[4] else ""
-                except (json.JSONDecodeError, AttributeError, TypeError):
-                    ad_content = str(row[4]) if row[4] else ""
-                
-                # Parse target_chats (should be JSON string) - safer parsing
-                try:
-                    if row[5] and isinstance(row[5], str):
-                        target_chats = json.loads(row[5])
-                    elif isinstance(row[5], list):
-                        target_chats = row[5]
-                    else:
-                        target_chats = [str(row[5])] if row[5] else []
-                except (json.JSONDecodeError, TypeError):
-                    target_chats = [str(row[5])] if row[5] else []
-                
-                # Parse buttons if they exist - much safer parsing
-                buttons = []
-                try:
-                    if len(row) > 8 and row[8] is not None:
-                        if isinstance(row[8], str) and row[8]:
-                            buttons = json.loads(row[8])
-                        elif isinstance(row[8], list):
-                            buttons = row[8]
-                except (json.JSONDecodeError, IndexError, TypeError):
-                    buttons = []
-                
-                # Parse target_mode if it exists - safer parsing
-                try:
-                    target_mode = str(row[9]) if len(row) > 9 and row[9] else 'specific'
-                except (IndexError, TypeError):
-                    target_mode = 'specific'
-                
-                campaigns.append({
-                    'id': row[0],                    # ac.id
-                    'user_id': row[1],               # ac.user_id  
-                    'account_id': row[2],            # ac.account_id
-                    'campaign_name': row[3],         # ac.campaign_name
-                    'ad_content': ad_content,        # ac.ad_content (parsed)
-                    'target_chats': target_chats,    # ac.target_chats (parsed)
-                    'schedule_type': row[6],         # ac.schedule_type
-                    'schedule_time': row[7],         # ac.schedule_time
-                    'buttons': buttons,              # ac.buttons (parsed)
-                    'target_mode': target_mode,      # ac.target_mode (parsed)
-                    'is_active': bool(row[10]),      # ac.is_active
-                    'created_at': row[11],           # ac.created_at
-                    'last_run': row[12],             # ac.last_run
-                    'total_sends': row[13] or 0,     # ac.total_sends
-                    'account_name': row[14]          # ta.account_name
-                })
-            return campaigns
+            cursor = conn.execute(_USER_CAMPAIGNS_SQL, (user_id,))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield _row_to_campaign(row)
     
     def get_campaign(self, campaign_id: int) -> Optional[Dict]:
         """Get specific campaign by ID"""
-        import sqlite3
-        
         with self._get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT ac.id, ac.user_id, ac.account_id, ac.campaign_name, ac.ad_content, 
-                       ac.target_chats, ac.schedule_type, ac.schedule_time, ac.buttons, 
-                       ac.target_mode, ac.is_active, ac.immediate_start, ac.created_at, ac.last_run, 
-                       ac.total_sends, ta.account_name
-                FROM ad_campaigns ac
-                LEFT JOIN telegram_accounts ta ON ac.account_id = ta.id
-                WHERE ac.id = ?
-            ''', (campaign_id,))
-            row = cursor.fetchone()
-            
-            if row:
-                # Parse ad_content (could be JSON string or plain string) - safer parsing
-                try:
-                    if row[4] and isinstance(row[4], str) and row[4].startswith(('[', '{')):
-                        ad_content = json.loads(row[4])
-                    else:
-                        ad_content = str(row[4]) if row[4] else ""
-                except (json.JSONDecodeError, AttributeError, TypeError):
-                    ad_content = str(row[4]) if row[4] else ""
-                
-                # Parse target_chats (should be JSON string) - safer parsing
-                try:
-                    if row[5] and isinstance(row[5], str):
-                        target_chats = json.loads(row[5])
-                    elif isinstance(row[5], list):
-                        target_chats = row[5]
-                    else:
-                        target_chats = [str(row[5])] if row[5] else []
-                except (json.JSONDecodeError, TypeError):
-                    target_chats = [str(row[5])] if row[5] else []
-                
-                # Parse buttons if they exist - much safer parsing
-                buttons = []
-                try:
-                    if len(row) > 8 and row[8] is not None:
-                        if isinstance(row[8], str) and row[8]:
-                            buttons = json.loads(row[8])
-                        elif isinstance(row[8], list):
-                            buttons = row[8]
-                except (json.JSONDecodeError, IndexError, TypeError):
-                    buttons = []
-                
-                # Parse target_mode if it exists - safer parsing
-                try:
-                    target_mode = str(row[9]) if len(row) > 9 and row[9] else 'specific'
-                except (IndexError, TypeError):
-                    target_mode = 'specific'
-                
-                return {
-                    'id': row[0],                    # ac.id
-                    'user_id': row[1],               # ac.user_id  
-                    'account_id': row[2],            # ac.account_id
-                    'campaign_name': row[3],         # ac.campaign_name
-                    'ad_content': ad_content,        # ac.ad_content (parsed)
-                    'target_chats': target_chats,    # ac.target_chats (parsed)
-                    'schedule_type': row[6],         # ac.schedule_type
-                    'schedule_time': row[7],         # ac.schedule_time
-                    'buttons': buttons,              # ac.buttons (parsed)
-                    'target_mode': target_mode,      # ac.target_mode (parsed)
-                    'is_active': bool(row[10]),      # ac.is_active
-                    'immediate_start': bool(row[11]), # ac.immediate_start
-                    'created_at': row[12],           # ac.created_at
-                    'last_run': row[13],             # ac.last_run
-                    'total_sends': row[14] or 0,     # ac.total_sends
-                    'account_name': row[15]          # ta.account_name
-                }
-            return None
+            row = conn.execute(_GET_CAMPAIGN_SQL, (campaign_id,)).fetchone()
+            return _row_to_campaign(row) if row else None
     
     def update_campaign(self, campaign_id: int, **kwargs):
         """Update campaign details with SQL injection protection"""
-        import sqlite3
-        
-        # Strictly validate allowed fields to prevent SQL injection
-        allowed_fields = {
-            'campaign_name': str,
-            'ad_content': (str, dict, list),
-            'target_chats': (str, list),
-            'schedule_type': str,
-            'schedule_time': str,
-            'is_active': bool
-        }
-        
         updates = []
         values = []
         
         for field, value in kwargs.items():
-            # Validate field name
-            if field not in allowed_fields:
+            # Strictly validate field names against the whitelist to prevent SQL injection
+            spec = _CAMPAIGN_FIELD_SPEC.get(field)
+            if spec is None:
                 logger.warning(f"Attempted to update invalid field '{field}' for campaign {campaign_id}")
                 continue
             
-            # Validate field type
-            expected_type = allowed_fields[field]
+            expected_type, prepare = spec
             if not isinstance(value, expected_type):
                 logger.warning(f"Invalid type for field '{field}': expected {expected_type}, got {type(value)}")
                 continue
             
-            # Sanitize and prepare value
-            if field == 'target_chats' and isinstance(value, list):
-                value = json.dumps(value)
-            elif field == 'ad_content' and isinstance(value, (dict, list)):
-                value = json.dumps(value)
-            elif field == 'is_active' and not isinstance(value, bool):
-                value = bool(value)
-            
             updates.append(f"{field} = ?")
-            values.append(value)
+            values.append(prepare(value))
         
         if not updates:
             logger.warning(f"No valid updates provided for campaign {campaign_id}")
@@ -1534,72 +1755,51 @@ class BumpService:
     
     def delete_campaign(self, campaign_id: int):
         """Permanently delete campaign from database and clean up scheduler"""
-        import sqlite3
+        # Buffered performance rows of a deleted campaign must not be flushed afterwards
+        with self._pending_perf_lock:
+            self._pending_perf.pop(campaign_id, None)
         
         with self._get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Delete from ad_performance table first (foreign key constraint)
-            cursor.execute('DELETE FROM ad_performance WHERE campaign_id = ?', (campaign_id,))
-            
-            # Delete from ad_campaigns table
-            cursor.execute('DELETE FROM ad_campaigns WHERE id = ?', (campaign_id,))
-            
-            conn.commit()
+            # Both deletes in one write transaction (one WAL commit instead of two)
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Delete from ad_performance table first (foreign key constraint)
+                conn.execute('DELETE FROM ad_performance WHERE campaign_id = ?', (campaign_id,))
+                
+                # Delete from ad_campaigns table
+                conn.execute('DELETE FROM ad_campaigns WHERE id = ?', (campaign_id,))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
             logger.info(f"Permanently deleted campaign {campaign_id} from database")
             
         # Remove from active campaigns
-        if campaign_id in self.active_campaigns:
-            del self.active_campaigns[campaign_id]
+        if self.active_campaigns.pop(campaign_id, None) is not None:
             logger.info(f"Removed campaign {campaign_id} from active campaigns")
         
         # Clean up scheduled jobs for this campaign
-        import schedule
-        jobs_to_remove = []
-        for job in schedule.jobs:
-            if hasattr(job, 'job_func') and hasattr(job.job_func, 'args') and job.job_func.args and job.job_func.args[0] == campaign_id:
-                jobs_to_remove.append(job)
-        
-        for job in jobs_to_remove:
+        for job in self._jobs_by_campaign.pop(campaign_id, ()):
             schedule.cancel_job(job)
+            self._active_job_count -= 1
             logger.info(f"Cancelled scheduled job for campaign {campaign_id}")
         
         logger.info(f"Campaign {campaign_id} completely cleaned up")
     
     def initialize_telegram_client(self, account_id: int, cache_client: bool = False) -> Optional[TelegramClient]:
         """Initialize Telegram client - Thread-safe version for scheduler"""
-        # Use thread-safe semaphore to prevent simultaneous client initialization
-        with self.client_init_semaphore:
-            try:
-                # Always run in a separate thread to avoid event loop conflicts
-                import concurrent.futures
-                import threading
-                
-                # Check if we're in the main thread (where the bot runs)
-                current_thread = threading.current_thread()
-                is_main_thread = current_thread == threading.main_thread()
-                
-                if is_main_thread:
-                    # We're in the main thread - use ThreadPoolExecutor to avoid blocking
-                    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                        future = executor.submit(self._sync_initialize_client, account_id, cache_client)
-                        return future.result(timeout=30)  # 30 second timeout
-                else:
-                    # We're already in a background thread - run directly
-                    return self._sync_initialize_client(account_id, cache_client)
-                    
-            except Exception as e:
-                logger.error(f"Failed to initialize client for account {account_id}: {e}")
-                return None
+        # Initialization runs on the client loop, serialized per account by asyncio locks
+        try:
+            return self._sync_initialize_client(account_id, cache_client)
+        except Exception as e:
+            logger.error(f"Failed to initialize client for account {account_id}: {e}")
+            return None
     
     def _sync_initialize_client(self, account_id: int, cache_client: bool = False) -> Optional[TelegramClient]:
-        """Synchronous wrapper for client initialization in a new thread"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._async_initialize_client(account_id, cache_client))
-        finally:
-            loop.close()
+        """Synchronous wrapper for client initialization on the client loop"""
+        if cache_client:
+            return self._run_on_client_loop(self._get_client(account_id), timeout=30)
+        return self._run_on_client_loop(self._async_initialize_client(account_id, cache_client), timeout=30)
     
     async def _async_initialize_client(self, account_id: int, cache_client: bool = False) -> Optional[TelegramClient]:
         """Async helper for client initialization using telethon_manager (no interactive auth)"""
@@ -1609,7 +1809,7 @@ class BumpService:
             self.client_last_used[account_id] = time.time()
             return self.telegram_clients[account_id]
         
-        account = self.db.get_account(account_id)
+        account = await self._run_db(self.db.get_account, account_id)
         if not account:
             logger.error(f"Account {account_id} not found")
             return None
@@ -1637,8 +1837,13 @@ class BumpService:
             try:
                 from config import Config
                 storage_channel_id = Config.STORAGE_CHANNEL_ID
+                storage_cache_key = (account_id, str(storage_channel_id))
+                storage_channel = None
                 
-                if storage_channel_id:
+                if storage_channel_id and storage_cache_key in self._storage_entity_cache:
+                    # Access was already confirmed for this account; skip the probe RPCs
+                    logger.debug("♻️ Storage channel %s already resolved for account %s", storage_channel_id, account_id)
+                elif storage_channel_id:
                     logger.info(f"🔄 AUTO-JOIN: Ensuring worker account has access to storage channel {storage_channel_id}")
                     
                     # Convert string ID to integer for Telethon
@@ -1719,6 +1924,9 @@ class BumpService:
                                     logger.warning(f"💡 Consider restarting the service to refresh session files")
                         else:
                             logger.warning(f"❌ Channel access failed with non-entity error: {access_error}")
+                    
+                    if storage_channel is not None:
+                        self._storage_entity_cache[storage_cache_key] = storage_channel
                 else:
                     logger.info(f"⚠️ STORAGE_CHANNEL_ID not configured - skipping auto-join")
                     
@@ -1742,10 +1950,8 @@ class BumpService:
             is_main_thread = current_thread == threading.main_thread()
             
             if is_main_thread:
-                # We're in the main thread - use ThreadPoolExecutor to avoid blocking
-                import concurrent.futures
-                executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-                future = executor.submit(self._sync_send_ad, campaign_id)
+                # We're in the main thread - hand off to the shared executor to avoid blocking
+                future = self._send_executor.submit(self._sync_send_ad, campaign_id)
                 
                 if wait_for_completion:
                     # Only wait if explicitly requested (old behavior)
@@ -1763,20 +1969,19 @@ class BumpService:
             return False
     
     def _sync_send_ad(self, campaign_id: int):
-        """Synchronous wrapper for send_ad in a new thread"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        """Synchronous wrapper for send_ad - runs on the persistent client loop"""
         try:
-            return loop.run_until_complete(self._async_send_ad(campaign_id))
+            return self._run_on_client_loop(self._async_send_ad(campaign_id))
         finally:
-            loop.close()
+            # Persist rows buffered by a run that ended early
+            self._flush_ad_performance(campaign_id)
     
     async def _async_send_ad(self, campaign_id: int):
         """Async helper for send_ad"""
         logger.info(f"🚀 Starting _async_send_ad for campaign {campaign_id}")
         
         try:
-            campaign = self.get_campaign(campaign_id)
+            campaign = await self._run_db(self.get_campaign, campaign_id)
             if not campaign:
                 logger.error(f"❌ Campaign {campaign_id} not found!")
                 return False
@@ -1793,7 +1998,7 @@ class BumpService:
             return
         
         # Get account info for logging
-        account = self.db.get_account(campaign['account_id'])
+        account = await self._run_db(self._get_account_cached, campaign['account_id'])
         account_name = account['account_name'] if account else f"Account_{campaign['account_id']}"
         account_id = campaign['account_id']
         
@@ -1809,10 +2014,10 @@ class BumpService:
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
         
         # Initialize tracking for this account
-        self._init_account_tracking(account_id, account.get('created_at'))
+        await self._run_db(self._init_account_tracking, account_id, account.get('created_at'))
         
         # 🆕 Check if account is in warm-up mode
-        is_warmup, warmup_info = self._is_account_in_warmup(account_id)
+        is_warmup, warmup_info = await self._run_db(self._is_account_in_warmup, account_id)
         if is_warmup:
             days_remaining = warmup_info.get('days_remaining', 0)
             logger.warning(f"🆕 WARM-UP MODE ACTIVE for account {account_id}")
@@ -1829,24 +2034,24 @@ class BumpService:
         
         # Check if account can send (if we have estimate)
         if estimated_messages > 0:
-            can_send, reason = self._check_account_can_send(account_id, estimated_messages)
+            can_send, reason = await self._run_db(self._check_account_can_send, account_id, estimated_messages)
             if not can_send:
                 logger.error(f"🛡️ ANTI-BAN BLOCK: {reason}")
                 logger.error(f"❌ Campaign {campaign_id} aborted to protect account from ban")
                 return False
         
         # Record campaign start
-        self._record_campaign_start(account_id)
+        await self._run_db(self._record_campaign_start, account_id)
         logger.info(f"🛡️ ANTI-BAN: Campaign {campaign_id} passed pre-flight checks")
         
         # 🚨 Check peer flood status (pre-ban warning)
-        is_blocked, flood_reason = self._check_peer_flood_status(account_id)
+        is_blocked, flood_reason = await self._run_db(self._check_peer_flood_status, account_id)
         if is_blocked:
             logger.error(f"⛔ PEER FLOOD BLOCK: {flood_reason}")
             logger.error(f"❌ Campaign {campaign_id} aborted - account in cooldown after peer flood")
             return False
         
-        # YOLO MODE: Use fresh client for scheduled execution with aggressive retries
+        # YOLO MODE: Reuse the account's long-lived client, reconnecting with aggressive retries
         # Maximum performance configuration with no compromises
         from config import Config
         max_client_retries = getattr(Config, 'MAX_RETRY_ATTEMPTS', 5)  # YOLO MODE: 5 retries
@@ -1854,7 +2059,7 @@ class BumpService:
         
         for client_attempt in range(max_client_retries):
             try:
-                client = await self._async_initialize_client(campaign['account_id'], cache_client=False)
+                client = await self._get_client(campaign['account_id'])
                 if client:
                     # Test client with a simple API call
                     await client.get_me()
@@ -1869,6 +2074,7 @@ class BumpService:
                         await client.disconnect()
                     except:
                         pass
+                self._evict_client(campaign['account_id'])
                 client = None
             
             if client_attempt < max_client_retries - 1:
@@ -1885,7 +2091,11 @@ class BumpService:
             from config import Config
             storage_channel_id = Config.STORAGE_CHANNEL_ID
             if storage_channel_id:
-                storage_channel = await client.get_entity(int(storage_channel_id))
+                storage_cache_key = (account_id, str(storage_channel_id))
+                storage_channel = self._storage_entity_cache.get(storage_cache_key)
+                if storage_channel is None:
+                    storage_channel = await client.get_entity(int(storage_channel_id))
+                    self._storage_entity_cache[storage_cache_key] = storage_channel
                 logger.info(f"✅ Storage channel ready for forwarding: {storage_channel.title}")
         except Exception as e:
             logger.warning(f"⚠️ Could not get storage channel: {e}")
@@ -1898,39 +2108,10 @@ class BumpService:
         
         # Create buttons from campaign data or use default
         
-        # Create ReplyKeyboardMarkup for worker account (persistent bottom keyboard)
-        telethon_reply_markup = None
-        if buttons and len(buttons) > 0:
-            try:
-                # Create button rows for ReplyKeyboardMarkup with text buttons
-                button_rows = []
-                for button_info in buttons:
-                    if button_info.get('text'):
-                        # Create simple text button for ReplyKeyboardMarkup
-                        from telethon.tl.types import KeyboardButton
-                        button_row = [KeyboardButton(
-                            text=button_info['text']
-                        )]
-                        button_rows.append(button_row)
-                        logger.info(f"✅ Created ReplyKeyboard button: '{button_info['text']}'")
-                
-                if button_rows:
-                    # Create ReplyKeyboardMarkup (persistent bottom keyboard)
-                    from telethon.tl.types import ReplyKeyboardMarkup
-                    telethon_reply_markup = ReplyKeyboardMarkup(
-                        rows=button_rows,
-                        resize=True,        # Makes buttons large and full-width
-                        persistent=True,    # Stays visible for ALL messages
-                        selective=False     # Shows to everyone in group
-                    )
-                    logger.info(f"🔘 Created ReplyKeyboardMarkup with {len(button_rows)} URL button rows")
-                    logger.info(f"🔘 ReplyKeyboardMarkup type: {type(telethon_reply_markup)}")
-                else:
-                    logger.warning(f"⚠️ No valid URL buttons created")
-                    telethon_reply_markup = None
-            except Exception as e:
-                logger.error(f"❌ ReplyKeyboardMarkup creation failed: {e}")
-                telethon_reply_markup = None
+        # Create ReplyKeyboardMarkup for worker account (persistent bottom keyboard) once per run;
+        # the markup itself is cached by button texts and shared by every target send
+        campaign_ctx = self._build_campaign_context(campaign)
+        telethon_reply_markup = campaign_ctx.telethon_reply_markup
         
         # Store button data for bot to use later
         campaign_buttons = buttons if buttons and len(buttons) > 0 else []
@@ -1953,24 +2134,13 @@ class BumpService:
             dialogs = await client.get_dialogs()
             logger.info(f"🔍 DISCOVERY: Retrieved {len(dialogs)} total dialogs from account")
             
-            target_entities = []
-            group_count = 0
-            for dialog in dialogs:
-                if dialog.is_group:
-                    target_entities.append(dialog.entity)
-                    group_count += 1
-                    logger.info(f"✅ FOUND GROUP #{group_count}: {dialog.name} (ID: {dialog.id})")
+            # is_group covers both basic groups and megagroups (broadcast channels are excluded)
+            target_entities = [dialog.entity for dialog in dialogs if dialog.is_group]
             
             logger.info(f"🎯 DISCOVERY COMPLETE: Found {len(target_entities)} groups total for campaign {campaign_id}")
         else:
             # Convert chat IDs to entities
-            target_entities = []
-            for chat_id in target_chats:
-                try:
-                    entity = await client.get_entity(chat_id)
-                    target_entities.append(entity)
-                except Exception as e:
-                    logger.error(f"Failed to get entity for {chat_id}: {e}")
+            target_entities = await self._resolve_target_entities(client, target_chats)
         
         # HUMAN-LIKE BEHAVIOR: Slightly randomize group order to avoid patterns
         # Shuffle in small chunks to maintain some order but add variance
@@ -1999,15 +2169,16 @@ class BumpService:
         logger.info(f"🤖 ANTI-DETECTION: Using human-like random delays (2-6 seconds)")
         
         for idx, chat_entity in enumerate(target_entities, 1):
+            chat_title = getattr(chat_entity, 'title', 'Unknown')  # Used by every log line below
             message = None
             try:
                 # YOLO MODE FIX: Handle different content types including linked messages
                 if isinstance(ad_content, list) and ad_content:
-                    logger.info(f"🔥 YOLO MODE: Processing {len(ad_content)} ad content items for {chat_entity.title}")
+                    logger.info(f"🔥 YOLO MODE: Processing {len(ad_content)} ad content items for {chat_title}")
                     
                     # Process linked messages (the actual format we're getting)
                     for message_data in ad_content:
-                        logger.info(f"🔍 YOLO DEBUG: Processing message_data: {message_data}")
+                        logger.debug("🔍 YOLO DEBUG: Processing message_data: %s", message_data)
                         
                         if message_data.get('type') == 'linked_message':
                             # This is a linked message - get it from storage and send with buttons
@@ -2025,8 +2196,8 @@ class BumpService:
                                 storage_channel_entity = None
                                 if storage_chat_id:
                                     try:
-                                        storage_channel_entity = await client.get_entity(storage_chat_id)
-                                        logger.debug(f"🔧 Got storage channel entity: {storage_channel_entity.title if hasattr(storage_channel_entity, 'title') else 'Unknown'}")
+                                        storage_channel_entity = await self._get_storage_chat_entity(client, account_id, storage_chat_id)
+                                        logger.debug("🔧 Got storage channel entity: %s", storage_channel_entity.title if hasattr(storage_channel_entity, 'title') else 'Unknown')
                                     except Exception as entity_error:
                                         logger.error(f"❌ Failed to get storage channel entity: {entity_error}")
                                         storage_channel_entity = storage_channel  # Fallback to global storage_channel
@@ -2052,19 +2223,19 @@ class BumpService:
                                 )
                                 
                                 if sent_msg:
-                                    logger.info(f"🔥 YOLO SUCCESS: Forwarded message with PREMIUM EMOJIS + REAL BUTTONS to {chat_entity.title}!")
+                                    logger.info(f"🔥 YOLO SUCCESS: Forwarded message with PREMIUM EMOJIS + REAL BUTTONS to {chat_title}!")
                                     # Increment counters
                                     sent_count += 1
                                     buttons_sent_count += 1
                                     # Log performance
-                                    self.log_ad_performance(campaign_id, campaign['user_id'], str(chat_entity.id), sent_msg[0].id if isinstance(sent_msg, list) else sent_msg.id)
-                                    logger.info(f"✅ SUCCESS: Sent to {chat_entity.title} | Progress: {sent_count}/{len(target_entities)} ({(sent_count/len(target_entities)*100):.1f}%)")
+                                    await self._run_db(self.log_ad_performance, campaign_id, campaign['user_id'], str(chat_entity.id), sent_msg[0].id if isinstance(sent_msg, list) else sent_msg.id)
+                                    logger.info(f"✅ SUCCESS: Sent to {chat_title} | Progress: {sent_count}/{len(target_entities)} ({(sent_count/len(target_entities)*100):.1f}%)")
                                     
                                     # 🛡️ ANTI-BAN: Record message sent and use safe delays
-                                    self._record_message_sent(account_id)
+                                    await self._run_db(self._record_message_sent, account_id)
                                     
                                     # Check if in warm-up mode and use appropriate delay
-                                    is_warmup, _ = self._is_account_in_warmup(account_id)
+                                    is_warmup, _ = await self._run_db(self._is_account_in_warmup, account_id)
                                     if is_warmup:
                                         safe_delay = self._get_warmup_delay()  # 30-45 minute delays
                                         logger.info(f"🆕 WARM-UP MODE: Waiting {safe_delay/60:.1f} minutes (recovery mode)")
@@ -2084,13 +2255,13 @@ class BumpService:
                                 # Handle Telegram rate limiting - DON'T wait, skip this account
                                 wait_seconds = flood_error.seconds
                                 wait_minutes = wait_seconds // 60
-                                logger.error(f"🚨 FLOOD WAIT: Account hit rate limit at '{chat_entity.title}'")
+                                logger.error(f"🚨 FLOOD WAIT: Account hit rate limit at '{chat_title}'")
                                 logger.error(f"⏰ Telegram wants us to wait: {wait_minutes} minutes {wait_seconds % 60} seconds")
                                 logger.warning(f"⚠️ This account sent messages TOO FAST!")
                                 logger.info(f"📊 Progress before FloodWait: {sent_count}/{len(target_entities)} sent")
                                 
                                 # Mark account as temporarily restricted
-                                self._record_flood_wait(account_id, wait_seconds)
+                                await self._run_db(self._record_flood_wait, account_id, wait_seconds)
                                 
                                 # Add remaining groups (including current) to retry queue for next run
                                 remaining_groups = target_entities[idx:]
@@ -2105,32 +2276,32 @@ class BumpService:
                                 # Break out of sending loop - campaign stops here
                                 break
                             except errors.PeerFloodError:
-                                logger.error(f"🚨 PEER FLOOD ERROR at '{chat_entity.title}'")
-                                self._handle_peer_flood(account_id, account.get('account_name', 'Unknown'))
+                                logger.error(f"🚨 PEER FLOOD ERROR at '{chat_title}'")
+                                await self._run_db(self._handle_peer_flood, account_id, account.get('account_name', 'Unknown'))
                                 failed_count += 1
                                 break  # Stop campaign immediately - this is a serious warning
                             except errors.UserBannedInChannelError:
-                                logger.warning(f"⚠️ Account banned in channel '{chat_entity.title}' - Skipping")
+                                logger.warning(f"⚠️ Account banned in channel '{chat_title}' - Skipping")
                                 failed_count += 1
                                 continue  # Skip this group, continue with others
                             except errors.ChatWriteForbiddenError:
-                                logger.error(f"🚫 WRITE FORBIDDEN in '{chat_entity.title}' - Account may be shadow banned!")
+                                logger.error(f"🚫 WRITE FORBIDDEN in '{chat_title}' - Account may be shadow banned!")
                                 logger.error(f"💡 Account: {account.get('account_name')} may need 48-72h rest")
                                 failed_count += 1
                                 # Don't break - try other groups, but this is a warning sign
                                 continue
                             except errors.ChatRestrictedError as restrict_err:
-                                logger.error(f"🚫 CHAT RESTRICTED: '{chat_entity.title}' - {restrict_err}")
+                                logger.error(f"🚫 CHAT RESTRICTED: '{chat_title}' - {restrict_err}")
                                 failed_count += 1
                                 continue
                             except errors.SlowModeWaitError as slow_err:
-                                logger.warning(f"🐌 SLOW MODE: '{chat_entity.title}' - wait {slow_err.seconds}s")
+                                logger.warning(f"🐌 SLOW MODE: '{chat_title}' - wait {slow_err.seconds}s")
                                 # Wait and retry this group
                                 await asyncio.sleep(slow_err.seconds + 2)
                                 flood_retry_queue.append(chat_entity)
                                 continue
                             except Exception as linked_error:
-                                logger.error(f"❌ YOLO MODE: Failed to send to {chat_entity.title}: {type(linked_error).__name__}: {linked_error}")
+                                logger.error(f"❌ YOLO MODE: Failed to send to {chat_title}: {type(linked_error).__name__}: {linked_error}")
                                 failed_count += 1
                                 # Brief pause before trying next group
                                 await asyncio.sleep(random.uniform(1, 3))
@@ -2268,7 +2439,7 @@ class BumpService:
                                             
                                             if forwarded_messages:
                                                 message = forwarded_messages[0] if isinstance(forwarded_messages, list) else forwarded_messages
-                                                logger.info(f"✅ UNIFIED TELETHON: Forwarded message with premium emojis and buttons to {chat_entity.title}")
+                                                logger.info(f"✅ UNIFIED TELETHON: Forwarded message with premium emojis and buttons to {chat_title}")
                                                 forwarded_successfully = True
                                                 break
                                             else:
@@ -2307,7 +2478,7 @@ class BumpService:
                                         caption=final_caption,
                                         parse_mode='html'
                                     )
-                                    logger.info(f"✅ Media sent via download ({media_message['media_type']}) to {chat_entity.title}")
+                                    logger.info(f"✅ Media sent via download ({media_message['media_type']}) to {chat_title}")
                                     
                                     # Note: No cleanup needed - using permanent local media file
                                 else:
@@ -2318,11 +2489,11 @@ class BumpService:
                                             final_caption,
                                             parse_mode='html'
                                         )
-                                        logger.warning(f"⚠️ Media download failed, sent as text to {chat_entity.title}")
+                                        logger.warning(f"⚠️ Media download failed, sent as text to {chat_title}")
                                     else:
                                         continue  # Skip if no text content
                         except Exception as e:
-                            logger.error(f"❌ Failed to send combined media+text to {chat_entity.title}: {e}")
+                            logger.error(f"❌ Failed to send combined media+text to {chat_title}: {e}")
                             # Fallback to text message
                             if combined_text:
                                 # Try with inline buttons first, fallback to text
@@ -2333,7 +2504,7 @@ class BumpService:
                                         reply_markup=telethon_reply_markup,
                                         parse_mode='html'
                                     )
-                                    logger.info(f"✅ Text sent with inline buttons to {chat_entity.title}")
+                                    logger.info(f"✅ Text sent with inline buttons to {chat_title}")
                                 except Exception as button_error:
                                     # Fallback: Send with buttons as text
                                     logger.warning(f"Inline buttons failed for text, using text fallback: {button_error}")
@@ -2343,7 +2514,7 @@ class BumpService:
                                         reply_markup=telethon_reply_markup,
                                         parse_mode='html'
                                     )
-                                logger.info(f"📝 Sent as text fallback to {chat_entity.title}")
+                                logger.info(f"📝 Sent as text fallback to {chat_title}")
                             else:
                                 continue  # Skip if no text content
                     else:
@@ -2360,14 +2531,14 @@ class BumpService:
                                     reply_markup=telethon_reply_markup,
                                     parse_mode='html'
                                 )
-                                logger.info(f"✅ Combined text message sent to {chat_entity.title}")
+                                logger.info(f"✅ Combined text message sent to {chat_title}")
                             else:
                                 continue  # Skip if no content
                         except Exception as e:
-                            logger.error(f"❌ Failed to send text message to {chat_entity.title}: {e}")
+                            logger.error(f"❌ Failed to send text message to {chat_title}: {e}")
                             continue
                         except Exception as e:
-                            logger.error(f"❌ Failed to send combined media+text to {chat_entity.title}: {e}")
+                            logger.error(f"❌ Failed to send combined media+text to {chat_title}: {e}")
                             # Fallback to text message
                             if combined_text:
                                 # Try with inline buttons first, fallback to text
@@ -2378,7 +2549,7 @@ class BumpService:
                                         reply_markup=telethon_reply_markup,
                                         parse_mode='html'
                                     )
-                                    logger.info(f"✅ Text sent with inline buttons to {chat_entity.title}")
+                                    logger.info(f"✅ Text sent with inline buttons to {chat_title}")
                                 except Exception as button_error:
                                     # Fallback: Send with buttons as text
                                     logger.warning(f"Inline buttons failed for text, using text fallback: {button_error}")
@@ -2388,7 +2559,7 @@ class BumpService:
                                         reply_markup=telethon_reply_markup,
                                         parse_mode='html'
                                     )
-                                logger.info(f"📝 Sent as text fallback to {chat_entity.title}")
+                                logger.info(f"📝 Sent as text fallback to {chat_title}")
                             else:
                                 continue  # Skip if no text content
                 else:
@@ -2478,7 +2649,7 @@ class BumpService:
                                             logger.info(f"🔄 Using storage chat ID: {storage_chat_id_int}")
                                             
                                             # Get the message from storage channel (bot has access!)
-                                            storage_message = await client.get_messages(storage_chat_id_int, ids=storage_message_id)
+                                            storage_message = await self._get_storage_message(client, account_id, storage_chat_id_int, storage_message_id)
                                             # Note: get_messages with single ID returns single Message object, not list
                                         except Exception as storage_access_error:
                                             logger.error(f"❌ Storage channel access failed: {storage_access_error}")
@@ -2492,7 +2663,7 @@ class BumpService:
                                                     logger.info(f"✅ Session refreshed, retrying media access...")
                                                     
                                                     # Retry after session refresh
-                                                    storage_message = await client.get_messages(storage_chat_id_int, ids=storage_message_id)
+                                                    storage_message = await self._get_storage_message(client, account_id, storage_chat_id_int, storage_message_id)
                                                     logger.info(f"✅ Media access successful after session refresh!")
                                                 except Exception as retry_error:
                                                     logger.error(f"❌ Media access failed even after session refresh: {retry_error}")
@@ -2535,7 +2706,7 @@ class BumpService:
                                                 # Buttons ready for sending
                                                 
                                                 # Send directly with all components (media + premium emojis + buttons)
-                                                logger.info(f"🚀 Sending message with ALL components to {chat_entity.title}")
+                                                logger.info(f"🚀 Sending message with ALL components to {chat_title}")
                                                 
                                                 # Send with buttons if available
                                                 if buttons and len(buttons) > 0:
@@ -2557,8 +2728,8 @@ class BumpService:
                                                         
                                                         # Send message with ALL components using send_file
                                                         logger.info(f"🚀 SENDING message with media + premium emojis + InlineKeyboardMarkup buttons")
-                                                        logger.info(f"🔍 DEBUG: reply_markup type: {type(reply_markup)}")
-                                                        logger.info(f"🔍 DEBUG: reply_markup value: {reply_markup}")
+                                                        logger.debug("🔍 DEBUG: reply_markup type: %s", type(reply_markup))
+                                                        logger.debug("🔍 DEBUG: reply_markup value: %s", reply_markup)
                                                         
                                                         # FORWARD the storage message to preserve InlineKeyboardMarkup buttons!
                                                         # This is how user accounts can send InlineKeyboardMarkup - by forwarding!
@@ -2575,7 +2746,7 @@ class BumpService:
                                                                 
                                                                 # SOLUTION: Create new message with text-based buttons (user accounts cannot forward inline buttons)
                                                                 # Get original message content
-                                                                original_message = await client.get_messages(storage_channel, ids=storage_message.id)
+                                                                original_message = await self._get_storage_message(client, account_id, storage_channel, storage_message.id)
                                                                 if not original_message:
                                                                     logger.error("Could not get original message from storage")
                                                                     continue
@@ -2610,7 +2781,7 @@ class BumpService:
                                                                     )
                                                                 
                                                                 if sent_msg:
-                                                                    logger.info(f"✅ SUCCESS: Worker sent message with text-based clickable buttons to {chat_entity.title}!")
+                                                                    logger.info(f"✅ SUCCESS: Worker sent message with text-based clickable buttons to {chat_title}!")
                                                                     buttons_sent_count += 1
                                                                     forwarded_successfully = True
                                                                     break
@@ -2636,7 +2807,7 @@ class BumpService:
                                                                 parse_mode=None,       # Let entities handle formatting
                                                                 link_preview=False
                                                             )
-                                                            logger.info(f"✅ Sent new message without buttons to {chat_entity.title}")
+                                                            logger.info(f"✅ Sent new message without buttons to {chat_title}")
                                                         
                                                         # DEBUG: Verify sent message has InlineKeyboardMarkup buttons
                                                         if hasattr(sent_msg, 'reply_markup') and sent_msg.reply_markup:
@@ -2653,7 +2824,7 @@ class BumpService:
                                                         else:
                                                             logger.warning(f"⚠️ WARNING: Sent message may not have premium emojis")
                                                         
-                                                        logger.info(f"✅ SUCCESS: Worker sent message with media + premium emojis + InlineKeyboardMarkup buttons to {chat_entity.title}!")
+                                                        logger.info(f"✅ SUCCESS: Worker sent message with media + premium emojis + InlineKeyboardMarkup buttons to {chat_title}!")
                                                         buttons_sent_count += 1
                                                         continue
                                                         
@@ -2692,13 +2863,14 @@ class BumpService:
                                             logger.info(f"🚀 ULTIMATE FIX: Using database caption + entities + storage media + buttons")
                                             
                                             # 🔥 FALLBACK BUTTON DEBUG: Log button details before sending
-                                            logger.info(f"🔥 FALLBACK REPLY KEYBOARD DEBUG: telethon_reply_markup type: {type(telethon_reply_markup)}")
-                                            logger.info(f"🔥 FALLBACK REPLY KEYBOARD DEBUG: telethon_reply_markup content: {telethon_reply_markup}")
-                                            if telethon_reply_markup and hasattr(telethon_reply_markup, 'rows'):
-                                                for i, row in enumerate(telethon_reply_markup.rows):
-                                                    logger.info(f"🔥 FALLBACK REPLY KEYBOARD DEBUG: Row {i}: {row}")
-                                                    for j, btn in enumerate(row):
-                                                        logger.info(f"🔥 FALLBACK REPLY KEYBOARD DEBUG: Button {i},{j}: {btn} (type: {type(btn)})")
+                                            if logger.isEnabledFor(logging.DEBUG):
+                                                logger.debug("🔥 FALLBACK REPLY KEYBOARD DEBUG: telethon_reply_markup type: %s", type(telethon_reply_markup))
+                                                logger.debug("🔥 FALLBACK REPLY KEYBOARD DEBUG: telethon_reply_markup content: %s", telethon_reply_markup)
+                                                if telethon_reply_markup and hasattr(telethon_reply_markup, 'rows'):
+                                                    for i, row in enumerate(telethon_reply_markup.rows):
+                                                        logger.debug("🔥 FALLBACK REPLY KEYBOARD DEBUG: Row %s: %s", i, row)
+                                                        for j, btn in enumerate(row):
+                                                            logger.debug("🔥 FALLBACK REPLY KEYBOARD DEBUG: Button %s,%s: %s (type: %s)", i, j, btn, type(btn))
                                             
                                             # 🚀 FALLBACK: BUTTONS PRIORITY!
                                             logger.info(f"🚀 FALLBACK: Prioritizing buttons for functionality!")
@@ -2714,7 +2886,7 @@ class BumpService:
                                             )
                                             logger.info(f"✅ FALLBACK: Media + Buttons sent!")
                                             
-                                            logger.info(f"🎉 FALLBACK: Media + Buttons sent to {chat_entity.title}")
+                                            logger.info(f"🎉 FALLBACK: Media + Buttons sent to {chat_title}")
                                             
                                             # Debug: Check if message has reply markup
                                             if hasattr(message, 'reply_markup') and message.reply_markup:
@@ -2758,7 +2930,7 @@ class BumpService:
                                             formatting_entities=telethon_entities,
                                             reply_markup=telethon_reply_markup
                                         )
-                                        logger.info(f"✅ Text sent with PREMIUM EMOJIS and inline buttons to {chat_entity.title}")
+                                        logger.info(f"✅ Text sent with PREMIUM EMOJIS and inline buttons to {chat_title}")
                                     else:
                                         # Fallback: Send without entities but with buttons
                                         message = await client.send_message(
@@ -2766,7 +2938,7 @@ class BumpService:
                                             original_text,
                                             reply_markup=telethon_reply_markup
                                         )
-                                        logger.info(f"✅ Text sent with inline buttons to {chat_entity.title}")
+                                        logger.info(f"✅ Text sent with inline buttons to {chat_title}")
                                 else:
                                     # Send without premium emoji entities but with buttons
                                     message = await client.send_message(
@@ -2774,7 +2946,7 @@ class BumpService:
                                         original_text,
                                         reply_markup=telethon_reply_markup
                                     )
-                                    logger.info(f"✅ Text sent with inline buttons to {chat_entity.title}")
+                                    logger.info(f"✅ Text sent with inline buttons to {chat_title}")
                                 
                             except Exception as text_error:
                                 logger.error(f"Text fallback failed: {text_error}")
@@ -2788,15 +2960,15 @@ class BumpService:
                 
                 # Log the performance
                 if message:
-                    self.log_ad_performance(campaign_id, campaign['user_id'], str(chat_entity.id), message.id)
+                    await self._run_db(self.log_ad_performance, campaign_id, campaign['user_id'], str(chat_entity.id), message.id)
                     sent_count += 1
-                    logger.info(f"Scheduled ad sent to {chat_entity.title} ({chat_entity.id}) for campaign {campaign['campaign_name']}")
+                    logger.info(f"Scheduled ad sent to {chat_title} ({chat_entity.id}) for campaign {campaign['campaign_name']}")
                 
                     # 🛡️ ANTI-BAN: Record message sent and use safe delay
-                    self._record_message_sent(account_id)
+                    await self._run_db(self._record_message_sent, account_id)
                     
                     # Check if in warm-up mode
-                    is_warmup, _ = self._is_account_in_warmup(account_id)
+                    is_warmup, _ = await self._run_db(self._is_account_in_warmup, account_id)
                     if is_warmup:
                         safe_delay = self._get_warmup_delay()
                         logger.info(f"🆕 WARM-UP MODE: Waiting {safe_delay/60:.1f} minutes (recovery mode)")
@@ -2807,8 +2979,8 @@ class BumpService:
                     await asyncio.sleep(safe_delay)
                 
             except Exception as e:
-                logger.error(f"Failed to send scheduled ad to {chat_entity.title if hasattr(chat_entity, 'title') else 'Unknown'}: {e}")
-                self.log_ad_performance(campaign_id, campaign['user_id'], str(chat_entity.id) if hasattr(chat_entity, 'id') else 'unknown', None, 'failed')
+                logger.error(f"Failed to send scheduled ad to {chat_title}: {e}")
+                await self._run_db(self.log_ad_performance, campaign_id, campaign['user_id'], str(chat_entity.id) if hasattr(chat_entity, 'id') else 'unknown', None, 'failed')
         
         # RETRY FLOOD-LIMITED GROUPS - Process groups that hit rate limits
         if len(flood_retry_queue) > 0:
@@ -2829,7 +3001,7 @@ class BumpService:
                                 
                                 # Get storage channel entity
                                 try:
-                                    storage_channel_entity = await client.get_entity(storage_chat_id)
+                                    storage_channel_entity = await self._get_storage_chat_entity(client, account_id, storage_chat_id)
                                 except Exception:
                                     storage_channel_entity = storage_channel
                                 
@@ -2847,14 +3019,14 @@ class BumpService:
                                 if sent_msg:
                                     sent_count += 1
                                     buttons_sent_count += 1
-                                    self.log_ad_performance(campaign_id, campaign['user_id'], str(retry_entity.id), sent_msg[0].id if isinstance(sent_msg, list) else sent_msg.id)
+                                    await self._run_db(self.log_ad_performance, campaign_id, campaign['user_id'], str(retry_entity.id), sent_msg[0].id if isinstance(sent_msg, list) else sent_msg.id)
                                     logger.info(f"✅ RETRY SUCCESS: Sent to {retry_entity.title} | Total sent: {sent_count}/{len(target_entities)}")
                                     
                                     # 🛡️ ANTI-BAN: Record message and use safe delay
-                                    self._record_message_sent(account_id)
+                                    await self._run_db(self._record_message_sent, account_id)
                                     
                                     # Check if in warm-up mode
-                                    is_warmup, _ = self._is_account_in_warmup(account_id)
+                                    is_warmup, _ = await self._run_db(self._is_account_in_warmup, account_id)
                                     if is_warmup:
                                         safe_delay = self._get_warmup_delay()
                                         logger.info(f"🆕 WARM-UP MODE: Retry waiting {safe_delay/60:.1f} minutes (recovery mode)")
@@ -2878,7 +3050,7 @@ class BumpService:
             logger.info(f"🏁 RETRY PHASE COMPLETE")
         
         # Update campaign statistics
-        self.update_campaign_stats(campaign_id, sent_count)
+        await self._run_db(self.update_campaign_stats, campaign_id, sent_count)
         logger.info(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
         logger.info(f"✅ CAMPAIGN COMPLETE: {campaign['campaign_name']}")
         logger.info(f"📊 Results: {sent_count} sent successfully, {failed_count} failed out of {len(target_entities)} total groups")
@@ -2887,12 +3059,8 @@ class BumpService:
             logger.info(f"♻️ All rate-limited groups were retried after waiting")
         logger.info(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
         
-        # Disconnect client after scheduled execution to prevent asyncio loop issues
-        try:
-            await client.disconnect()
-            logger.info(f"Disconnected client for scheduled campaign {campaign_id}")
-        except Exception as e:
-            logger.warning(f"Failed to disconnect client for campaign {campaign_id}: {e}")
+        # Keep the client connected for the next run - only shutdown/idle cleanup disconnects it
+        self.client_last_used[campaign['account_id']] = time.time()
         
         # MULTI-USERBOT: Execute for additional accounts with delays
         await self._execute_additional_accounts(campaign_id, campaign)
@@ -2905,7 +3073,7 @@ class BumpService:
                 return
                 
             try:
-                additional_accounts_data = json.loads(additional_accounts) if isinstance(additional_accounts, str) else additional_accounts
+                additional_accounts_data = _json_loads(additional_accounts) if isinstance(additional_accounts, str) else additional_accounts
                 if not additional_accounts_data:
                     return
                     
@@ -2965,13 +3133,13 @@ class BumpService:
         
         try:
             # Get campaign data
-            campaign = self.get_campaign(campaign_id)
+            campaign = await self._run_db(self.get_campaign, campaign_id)
             if not campaign or not campaign['is_active']:
                 logger.error(f"❌ Campaign {campaign_id} not found or inactive for additional account {account_id}")
                 return
                 
             # Get account info
-            account = self.db.get_account(account_id)
+            account = await self._run_db(self._get_account_cached, account_id)
             if not account:
                 logger.error(f"❌ Additional account {account_id} not found")
                 return
@@ -2986,8 +3154,8 @@ class BumpService:
             # Get content variation
             content_variation = self._get_content_variation(campaign, content_variation_index)
             
-            # Initialize client for this account
-            client = await self._async_initialize_client(account_id)
+            # Reuse (or connect) the long-lived client for this account
+            client = await self._get_client(account_id)
             if not client:
                 logger.error(f"❌ Failed to initialize client for additional account {account_id}")
                 return
@@ -3022,18 +3190,14 @@ class BumpService:
                 logger.info(f"🎯 MULTI-USERBOT: Account {account_name} completed: {success_count}/{len(target_entities)} messages sent")
                 
             finally:
-                # Disconnect client
-                try:
-                    await client.disconnect()
-                    logger.info(f"🔌 MULTI-USERBOT: Disconnected client for {account_name}")
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to disconnect client for {account_name}: {e}")
+                # Keep the client connected for the next run
+                self.client_last_used[account_id] = time.time()
                     
         except Exception as e:
             logger.error(f"❌ Error executing additional account {account_id}: {e}")
         finally:
             # Log execution
-            self._log_campaign_execution(execution_log)
+            await self._run_db(self._log_campaign_execution, execution_log)
             duration = time.time() - start_time
             logger.info(f"⏱️ MULTI-USERBOT: Account {account_id} execution completed in {duration:.2f}s")
     
@@ -3073,7 +3237,7 @@ class BumpService:
             return None
             
         try:
-            variations = json.loads(content_variations) if isinstance(content_variations, str) else content_variations
+            variations = _json_loads(content_variations) if isinstance(content_variations, str) else content_variations
             if variations and len(variations) > variation_index:
                 selected_variation = variations[variation_index]
                 logger.info(f"📝 SPAM AVOIDANCE: Using content variation {variation_index + 1}/{len(variations)}")
@@ -3139,7 +3303,7 @@ class BumpService:
                     if storage_chat_id:
                         try:
                             storage_channel_entity = await client.get_entity(int(storage_chat_id))
-                            logger.debug(f"🔧 MULTI-USERBOT: Got storage channel entity for forwarding")
+                            logger.debug("🔧 MULTI-USERBOT: Got storage channel entity for forwarding")
                         except Exception as entity_error:
                             logger.error(f"❌ MULTI-USERBOT: Failed to get storage channel entity: {entity_error}")
                             # Try fallback with Config
@@ -3168,7 +3332,7 @@ class BumpService:
                     )
                     
                     if sent_msg:
-                        logger.debug(f"✅ Forwarded message to {chat_entity.title}")
+                        logger.debug("✅ Forwarded message to %s", chat_entity.title)
                     else:
                         logger.error(f"❌ Failed to forward message to {chat_entity.title}")
                         
@@ -3200,144 +3364,155 @@ class BumpService:
     
     def log_ad_performance(self, campaign_id: int, user_id: int, target_chat: str, 
                           message_id: Optional[int], status: str = 'sent'):
-        """Log ad performance"""
-        import sqlite3
+        """Buffer an ad performance row; rows are written in batches by _flush_ad_performance"""
+        from config import Config
+        with self._pending_perf_lock:
+            pending = self._pending_perf[campaign_id]
+            pending.append((campaign_id, user_id, target_chat, message_id, status))
+            batch_full = len(pending) >= Config.PERFORMANCE_FLUSH_BATCH_SIZE
+        if batch_full:
+            self._flush_ad_performance(campaign_id)
+    
+    def _flush_ad_performance(self, campaign_id: int, sent_count: Optional[int] = None):
+        """Write buffered performance rows (and optionally the run stats) in one transaction"""
+        with self._pending_perf_lock:
+            rows = self._pending_perf.pop(campaign_id, [])
+        if not rows and sent_count is None:
+            return
         
-        with self._get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO ad_performance 
-                (campaign_id, user_id, target_chat, message_id, status)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (campaign_id, user_id, target_chat, message_id, status))
-            conn.commit()
+        try:
+            with self._get_db_connection() as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    if rows:
+                        conn.executemany(_INSERT_PERF_SQL, rows)
+                    if sent_count is not None:
+                        conn.execute(_UPDATE_CAMPAIGN_STATS_SQL, (sent_count, campaign_id))
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+        except Exception as e:
+            logger.error(f"❌ Failed to write {len(rows)} performance rows for campaign {campaign_id}: {e}")
     
     def update_campaign_stats(self, campaign_id: int, sent_count: int):
-        """Update campaign statistics"""
-        import sqlite3
-        
-        with self._get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE ad_campaigns 
-                SET last_run = CURRENT_TIMESTAMP, total_sends = total_sends + ?
-                WHERE id = ?
-            ''', (sent_count, campaign_id))
-            conn.commit()
+        """Update campaign statistics (flushes any buffered performance rows in the same transaction)"""
+        self._flush_ad_performance(campaign_id, sent_count)
+    
+    def _register_schedule_job(self, trigger: ScheduleTrigger, campaign_id: int):
+        """Create the schedule.Job for a compiled trigger"""
+        if trigger.unit == 'day':
+            job = schedule.every().day.at(trigger.at)
+        elif trigger.unit in ('hours', 'minutes'):
+            job = getattr(schedule.every(trigger.interval), trigger.unit)
+        else:
+            # Weekday name, e.g. "monday"
+            job = getattr(schedule.every(), trigger.unit).at(trigger.at)
+        job = job.do(self.run_campaign_job, campaign_id)
+        self._jobs_by_campaign[campaign_id].append(job)
+        self._active_job_count += 1
+        self._scheduler_wakeup.set()
+        return job
     
     def schedule_campaign(self, campaign_id: int):
         """Schedule a campaign based on its schedule type"""
         campaign = self.get_campaign(campaign_id)
         if not campaign:
             return
-        
+        self._schedule_campaign_dict(campaign)
+    
+    def _schedule_campaign_dict(self, campaign: Dict):
+        """Schedule an already-loaded campaign (no extra database read)"""
+        campaign_id = campaign['id']
         schedule_type = campaign['schedule_type']
         schedule_time = campaign['schedule_time']
         
-        if schedule_type == 'daily':
-            schedule.every().day.at(schedule_time).do(self.run_campaign_job, campaign_id)
-        elif schedule_type == 'weekly':
-            # Assuming format like "Monday 14:30"
-            day, time_str = schedule_time.split(' ')
-            getattr(schedule.every(), day.lower()).at(time_str).do(self.run_campaign_job, campaign_id)
-        elif schedule_type == 'hourly':
-            job = schedule.every().hour.do(self.run_campaign_job, campaign_id)
+        # Parse schedule_time once per distinct schedule; the scheduler only sees the compiled trigger
+        try:
+            trigger = _compile_schedule(schedule_type, schedule_time)
+            parse_failed = False
+        except (ValueError, IndexError) as e:
+            if schedule_type != 'custom':
+                raise
+            logger.error(f"❌ Error parsing custom schedule '{schedule_time}': {e}")
+            trigger = None
+            parse_failed = True
+        
+        if parse_failed:
+            # Default to 10 minutes if parsing fails
+            self._register_schedule_job(ScheduleTrigger('minutes', 10), campaign_id)
+            logger.info(f"📅 Campaign {campaign_id} defaulted to every 10 minutes")
+        elif trigger is None:
+            logger.warning(f"⚠️ Unknown custom schedule format: {schedule_time}")
+        else:
+            self._register_schedule_job(trigger, campaign_id)
+            
             # Only run immediately if this is a new campaign with immediate_start=True
             # Existing campaigns loaded from database should not run immediately
-            if campaign.get('is_active', False) and campaign.get('immediate_start', False):
-                logger.info(f"🚀 Running campaign {campaign_id} immediately on hourly schedule activation")
-                self.run_campaign_job(campaign_id)
-            else:
-                logger.info(f"📅 Campaign {campaign_id} scheduled for hourly execution (no immediate start)")
-        elif schedule_type == 'custom':
-            # Parse custom interval (e.g., "every 3 minutes", "every 4 hours")
-            try:
-                if 'hour' in schedule_time.lower():
-                    hours = int(schedule_time.split()[1])
-                    job = schedule.every(hours).hours.do(self.run_campaign_job, campaign_id)
-                    
-                    # Only run immediately if this is a new campaign with immediate_start=True
-                    # Existing campaigns loaded from database should not run immediately
-                    campaign = self.get_campaign(campaign_id)
-                    if campaign and campaign.get('is_active', False) and campaign.get('immediate_start', False):
-                        logger.info(f"🚀 Running campaign {campaign_id} immediately on schedule activation")
-                        # Add staggered delay to prevent database conflicts
-                        import random
-                        delay = random.uniform(0.5, 2.0)  # Random delay between 0.5-2 seconds
-                        # Run in a separate thread to avoid blocking
-                        import threading
-                        threading.Thread(target=lambda: (time.sleep(delay), self.run_campaign_job(campaign_id)), daemon=True).start()
-                    else:
-                        logger.info(f"📅 Campaign {campaign_id} scheduled for custom execution (no immediate start)")
-                    
-                    logger.info(f"📅 Campaign {campaign_id} scheduled every {hours} hours")
-                elif 'minute' in schedule_time.lower():
-                    # Handle formats like "3 minutes", "every 3 minutes"
-                    parts = schedule_time.split()
-                    if len(parts) >= 2:
-                        # Find the number in the string
-                        for part in parts:
-                            if part.isdigit():
-                                minutes = int(part)
-                                break
-                        else:
-                            minutes = 10  # default
-                    else:
-                        minutes = 10  # default
-                    
-                    # Schedule the job to run every X minutes
-                    job = schedule.every(minutes).minutes.do(self.run_campaign_job, campaign_id)
-                    
-                    # IMPORTANT: Run the job immediately for the first time if campaign is active AND immediate_start is True
-                    campaign = self.get_campaign(campaign_id)
-                    if campaign and campaign.get('is_active', False) and campaign.get('immediate_start', False):
-                        logger.info(f"🚀 Running campaign {campaign_id} immediately on schedule activation")
-                        # Add staggered delay to prevent database conflicts
-                        import random
-                        delay = random.uniform(0.5, 2.0)  # Random delay between 0.5-2 seconds
-                        # Run in a separate thread to avoid blocking
-                        import threading
-                        threading.Thread(target=lambda: (time.sleep(delay), self.run_campaign_job(campaign_id)), daemon=True).start()
-                    else:
-                        logger.info(f"📅 Campaign {campaign_id} scheduled for first run (no immediate start)")
-                    
-                    logger.info(f"📅 Campaign {campaign_id} scheduled every {minutes} minutes")
-                elif schedule_time.isdigit():
-                    # If just a number, assume minutes
-                    minutes = int(schedule_time)
-                    job = schedule.every(minutes).minutes.do(self.run_campaign_job, campaign_id)
-                    
-                    # IMPORTANT: Run the job immediately for the first time if campaign is active AND immediate_start is True
-                    campaign = self.get_campaign(campaign_id)
-                    if campaign and campaign.get('is_active', False) and campaign.get('immediate_start', False):
-                        logger.info(f"🚀 Running campaign {campaign_id} immediately on schedule activation")
-                        # Add staggered delay to prevent database conflicts
-                        import random
-                        delay = random.uniform(0.5, 2.0)  # Random delay between 0.5-2 seconds
-                        # Run in a separate thread to avoid blocking
-                        import threading
-                        threading.Thread(target=lambda: (time.sleep(delay), self.run_campaign_job(campaign_id)), daemon=True).start()
-                    else:
-                        logger.info(f"📅 Campaign {campaign_id} scheduled for first run (no immediate start)")
-                    
-                    logger.info(f"📅 Campaign {campaign_id} scheduled every {minutes} minutes")
+            run_now = campaign.get('is_active', False) and campaign.get('immediate_start', False)
+            if schedule_type == 'hourly':
+                if run_now:
+                    logger.info(f"🚀 Running campaign {campaign_id} immediately on hourly schedule activation")
+                    self.run_campaign_job(campaign_id)
+                else:
+                    logger.info(f"📅 Campaign {campaign_id} scheduled for hourly execution (no immediate start)")
+            elif schedule_type == 'custom':
+                if run_now:
+                    logger.info(f"🚀 Running campaign {campaign_id} immediately on schedule activation")
+                    # Add staggered delay to prevent database conflicts
+                    delay = random.uniform(0.5, 2.0)  # Random delay between 0.5-2 seconds
+                    self._push_fire_at(time.time() + delay, self.run_campaign_job, campaign_id)
                 else:
-                    logger.warning(f"⚠️ Unknown custom schedule format: {schedule_time}")
-            except (ValueError, IndexError) as e:
-                logger.error(f"❌ Error parsing custom schedule '{schedule_time}': {e}")
-                # Default to 10 minutes if parsing fails
-                schedule.every(10).minutes.do(self.run_campaign_job, campaign_id)
-                logger.info(f"📅 Campaign {campaign_id} defaulted to every 10 minutes")
+                    logger.info(f"📅 Campaign {campaign_id} scheduled for first run (no immediate start)")
+                logger.info(f"📅 Campaign {campaign_id} scheduled every {trigger.interval} {trigger.unit}")
         
         self.active_campaigns[campaign_id] = campaign
         logger.info(f"Scheduled campaign {campaign_id} ({schedule_type} at {schedule_time})")
     
+    def _push_fire_at(self, due_time: float, callback, campaign_id: int):
+        """Run callback(campaign_id) on the scheduler thread once due_time has passed"""
+        with self._delayed_fires_lock:
+            heapq.heappush(self._delayed_fires, (due_time, next(self._delayed_fire_seq), callback, campaign_id))
+        self._scheduler_wakeup.set()
+    
+    def _run_due_fires(self) -> Optional[float]:
+        """Fire every delayed callback that is due; returns seconds until the next one (None if empty)"""
+        while True:
+            with self._delayed_fires_lock:
+                if not self._delayed_fires:
+                    return None
+                wait = self._delayed_fires[0][0] - time.time()
+                if wait > 0:
+                    return wait
+                _, _, callback, campaign_id = heapq.heappop(self._delayed_fires)
+            try:
+                callback(campaign_id)
+            except Exception as e:
+                logger.error(f"Error in delayed fire for campaign {campaign_id}: {e}")
+    
+    def _claim_campaign_slot(self, campaign_id: int) -> bool:
+        """Reserve the single run slot of a campaign; False if a run is already queued or running"""
+        with self._inflight_lock:
+            if campaign_id in self._inflight_campaigns:
+                return False
+            self._inflight_campaigns.add(campaign_id)
+            return True
+    
+    def _release_campaign_slot(self, campaign_id: int):
+        """Free the run slot once the campaign run has finished (or was never queued)"""
+        with self._inflight_lock:
+            self._inflight_campaigns.discard(campaign_id)
+    
     def run_campaign_job(self, campaign_id: int):
         """Execute scheduled campaign automatically - Queue-based for 50+ accounts with smart staggering"""
+        # Coalesce overlapping fires: a run that is still staggering, queued or sending wins
+        if not self._claim_campaign_slot(campaign_id):
+            logger.warning(f"⏭️ Campaign {campaign_id} is still queued or running - skipping this trigger")
+            return
+        
         try:
-            import datetime
-            current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            logger.info(f"🔄 Scheduler triggered campaign {campaign_id} at {current_time}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"🔄 Scheduler triggered campaign {campaign_id} at {time.strftime('%Y-%m-%d %H:%M:%S')}")
             
             # 🎯 SMART STAGGER: Apply delay if this campaign is part of a staggered group
             if hasattr(self, 'campaign_stagger_delays') and campaign_id in self.campaign_stagger_delays:
@@ -3347,25 +3522,37 @@ class BumpService:
                 logger.info(f"⏰ SMART STAGGER: Campaign {campaign_id} has {stagger_minutes:.0f}-minute delay")
                 logger.info(f"⏳ Waiting {stagger_minutes:.0f} minutes before starting (accounts sharing same message)")
                 
-                # Wait the stagger delay
-                time.sleep(stagger_delay)
-                
-                logger.info(f"✅ Stagger delay complete! Starting campaign {campaign_id} now")
-            
+                # Defer the start instead of sleeping on the scheduler thread; the run slot stays claimed
+                self._push_fire_at(time.time() + stagger_delay, self._start_staggered_campaign, campaign_id)
+                return
+        except Exception as e:
+            logger.error(f"Error in campaign scheduler for {campaign_id}: {e}")
+            self._release_campaign_slot(campaign_id)
+            return
+        
+        self._enqueue_campaign_run(campaign_id)
+    
+    def _start_staggered_campaign(self, campaign_id: int):
+        """Delayed-fire callback once a campaign's smart stagger delay has elapsed"""
+        logger.info(f"✅ Stagger delay complete! Starting campaign {campaign_id} now")
+        self._enqueue_campaign_run(campaign_id)
+    
+    def _enqueue_campaign_run(self, campaign_id: int):
+        """Validate a claimed campaign and hand it to the execution queue (releases the slot on failure)"""
+        queued = False
+        try:
             # Get campaign from database
             campaign = self.get_campaign(campaign_id)
             if not campaign:
                 logger.warning(f"Campaign {campaign_id} not found for scheduled execution - removing from active campaigns")
                 # Remove from active campaigns if campaign doesn't exist
-                if campaign_id in self.active_campaigns:
-                    del self.active_campaigns[campaign_id]
+                self.active_campaigns.pop(campaign_id, None)
                 return
                 
             if not campaign.get('is_active', False):
                 logger.warning(f"Campaign {campaign_id} is not active, removing from active campaigns")
                 # Remove inactive campaigns from active campaigns
-                if campaign_id in self.active_campaigns:
-                    del self.active_campaigns[campaign_id]
+                self.active_campaigns.pop(campaign_id, None)
                 return
             
             # Log campaign details
@@ -3374,7 +3561,7 @@ class BumpService:
             logger.info(f"👤 Account ID: {campaign['account_id']}")
             
             # Check account status
-            account = self.db.get_account(campaign['account_id'])
+            account = self._get_account_cached(campaign['account_id'])
             if not account:
                 logger.error(f"❌ Account {campaign['account_id']} not found for campaign {campaign_id}")
                 return
@@ -3389,30 +3576,33 @@ class BumpService:
             queue_size = self.execution_queue.qsize()
             logger.info(f"📥 Adding campaign {campaign_id} to execution queue (current queue size: {queue_size})")
             self.execution_queue.put(campaign_id)
+            queued = True
             logger.info(f"✅ Campaign {campaign_id} added to queue successfully")
             
         except Exception as e:
             logger.error(f"Error in campaign scheduler for {campaign_id}: {e}")
+        finally:
+            if not queued:
+                self._release_campaign_slot(campaign_id)
     
     def cleanup_corrupted_sessions(self):
         """Clean up any corrupted session files"""
-        import os
-        import glob
-        
         try:
-            # Find all bump session files
-            session_files = glob.glob("bump_session_*.session")
             cleaned_count = 0
             
-            for session_file in session_files:
-                try:
-                    # Check if file is empty or corrupted
-                    if os.path.getsize(session_file) == 0:
-                        os.remove(session_file)
-                        cleaned_count += 1
-                        logger.info(f"Cleaned up empty session file: {session_file}")
-                except Exception as e:
-                    logger.warning(f"Could not clean up session file {session_file}: {e}")
+            # Single directory pass; scandir entries reuse the dirent stat data
+            with os.scandir('.') as entries:
+                for entry in entries:
+                    if not (entry.name.startswith('bump_session_') and entry.name.endswith('.session')):
+                        continue
+                    try:
+                        # Check if file is empty or corrupted
+                        if entry.is_file() and entry.stat().st_size == 0:
+                            os.remove(entry.path)
+                            cleaned_count += 1
+                            logger.info(f"Cleaned up empty session file: {entry.name}")
+                    except Exception as e:
+                        logger.warning(f"Could not clean up session file {entry.name}: {e}")
             
             if cleaned_count > 0:
                 logger.info(f"Cleaned up {cleaned_count} corrupted session files")
@@ -3440,17 +3630,31 @@ class BumpService:
                     # Log scheduler status every 60 seconds
                     current_time = time.time()
                     if current_time - last_log_time >= 60:
-                        jobs = schedule.get_jobs()
-                        logger.info(f"⏰ Scheduler status: {len(jobs)} active jobs, {len(self.active_campaigns)} active campaigns")
-                        # Log details about each job
-                        for job in jobs:
-                            next_run = job.next_run.strftime("%H:%M:%S") if job.next_run else "Not scheduled"
-                            logger.info(f"  📅 Job scheduled for: {next_run}")
+                        logger.info(f"⏰ Scheduler status: {self._active_job_count} active jobs, {len(self.active_campaigns)} active campaigns")
+                        # Per-job details walk the whole job list; only worth it when debugging
+                        if logger.isEnabledFor(logging.DEBUG):
+                            for job in schedule.get_jobs():
+                                next_run = job.next_run.strftime("%H:%M:%S") if job.next_run else "Not scheduled"
+                                logger.debug("  📅 Job scheduled for: %s", next_run)
                         last_log_time = current_time
                     
-                    # Run pending scheduled jobs
+                    # Clear before draining: a set() from here on is either seen by the drain
+                    # below or makes the wait return at once, so no wakeup is lost
+                    self._scheduler_wakeup.clear()
+                    
+                    # Run pending scheduled jobs and any delayed starts that are due
                     schedule.run_pending()
-                    time.sleep(1)  # Check every second
+                    next_fire = self._run_due_fires()
+                    
+                    # Sleep until the next job is due (or the next status log) instead of polling;
+                    # newly registered jobs, delayed fires and stop_scheduler wake the thread early
+                    idle_seconds = schedule.idle_seconds()
+                    timeout = last_log_time + 60 - time.time()
+                    if idle_seconds is not None:
+                        timeout = min(timeout, idle_seconds)
+                    if next_fire is not None:
+                        timeout = min(timeout, next_fire)
+                    self._scheduler_wakeup.wait(max(0.0, timeout))
                 except Exception as e:
                     logger.error(f"Error in scheduler worker: {e}")
                     time.sleep(5)  # Wait 5 seconds on error
@@ -3464,9 +3668,18 @@ class BumpService:
     def stop_scheduler(self):
         """Stop the campaign scheduler"""
         self.is_running = False
+        self._scheduler_wakeup.set()
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=5)
         schedule.clear()
+        self._jobs_by_campaign.clear()
+        self._active_job_count = 0
+        with self._delayed_fires_lock:
+            pending, self._delayed_fires = self._delayed_fires, []
+        # Staggered starts hold their campaign's run slot; give it back
+        for _, _, callback, campaign_id in pending:
+            if callback == self._start_staggered_campaign:
+                self._release_campaign_slot(campaign_id)
         logger.info("Bump service scheduler stopped")
     
     def _calculate_smart_stagger_delay(self, account_count: int) -> int:
@@ -3491,21 +3704,12 @@ class BumpService:
     
     def load_existing_campaigns(self):
         """Load and schedule existing active campaigns with smart staggering"""
-        import sqlite3
         from config import Config
         from collections import defaultdict
         
         with self._get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get all active campaigns with their content (to group by same message)
-            cursor.execute('''
-                SELECT id, campaign_name, schedule_time, account_id, ad_content
-                FROM ad_campaigns 
-                WHERE is_active = 1
-                ORDER BY id
-            ''')
-            rows = cursor.fetchall()
+            # Get all active campaigns in one query; the rows are scheduled directly below
+            rows = conn.execute(_ACTIVE_CAMPAIGNS_SQL).fetchall()
             
             if not rows:
                 logger.info("✅ No active campaigns to load")
@@ -3514,18 +3718,14 @@ class BumpService:
             # Group campaigns by their message content (campaigns with same content = same message)
             message_groups = defaultdict(list)
             for row in rows:
-                campaign_id, campaign_name, schedule_time, account_id, ad_content = row
+                campaign_id = row['id']
+                ad_content = row['ad_content']
                 
                 # Create unique key based on ad_content (first 100 chars to avoid huge keys)
                 # Campaigns with identical content are assumed to be sharing the same message
                 content_key = str(ad_content)[:100] if ad_content else f"campaign_{campaign_id}"
                 
-                message_groups[content_key].append({
-                    'id': campaign_id,
-                    'name': campaign_name,
-                    'schedule': schedule_time,
-                    'account_id': account_id
-                })
+                message_groups[content_key].append(_row_to_campaign(row))
             
             logger.info(f"📊 Found {len(rows)} active campaigns grouped into {len(message_groups)} message types")
             
@@ -3539,8 +3739,7 @@ class BumpService:
                 
                 for index, campaign in enumerate(campaigns):
                     campaign_id = campaign['id']
-                    campaign_name = campaign['name']
-                    schedule_time = campaign['schedule']
+                    campaign_name = campaign['campaign_name']
                     
                     # Calculate stagger delay for this campaign
                     stagger_delay_seconds = index * stagger_minutes * 60  # Convert minutes to seconds
@@ -3551,7 +3750,7 @@ class BumpService:
                         logger.info(f"🚀 Campaign {campaign_id} ({campaign_name}): First account, starts immediately")
                     
                     # Schedule the campaign
-                    self.schedule_campaign(campaign_id)
+                    self._schedule_campaign_dict(campaign)
                     
                     # Apply stagger delay if this is not the first campaign in the group
                     if stagger_delay_seconds > 0 and Config.ENABLE_AUTO_STAGGER:
@@ -3559,7 +3758,7 @@ class BumpService:
                         if not hasattr(self, 'campaign_stagger_delays'):
                             self.campaign_stagger_delays = {}
                         self.campaign_stagger_delays[campaign_id] = stagger_delay_seconds
-                        logger.debug(f"📝 Stored {stagger_delay_seconds}s stagger delay for campaign {campaign_id}")
+                        logger.debug("📝 Stored %ss stagger delay for campaign %s", stagger_delay_seconds, campaign_id)
                     
                     total_campaigns_loaded += 1
             
@@ -3572,7 +3771,6 @@ class BumpService:
     
     def get_campaign_performance(self, campaign_id: int) -> Dict[str, Any]:
         """Get performance statistics for a campaign"""
-        import sqlite3
         
         with self._get_db_connection() as conn:
             cursor = conn.cursor()
@@ -3585,12 +3783,14 @@ class BumpService:
                 WHERE campaign_id = ?
             ''', (campaign_id,))
             row = cursor.fetchone()
+            total_attempts = row['total_attempts'] or 0
+            successful_sends = row['successful_sends'] or 0
             
             return {
-                'total_attempts': row[0] or 0,
-                'successful_sends': row[1] or 0,
-                'failed_sends': row[2] or 0,
-                'success_rate': (row[1] / row[0] * 100) if row[0] > 0 else 0
+                'total_attempts': total_attempts,
+                'successful_sends': successful_sends,
+                'failed_sends': row['failed_sends'] or 0,
+                'success_rate': (successful_sends / total_attempts * 100) if total_attempts > 0 else 0
             }
     
     def add_additional_account_to_campaign(self, campaign_id: int, account_id: int, delay_minutes: int = 0, content_variation_index: int = 0):
@@ -3602,10 +3802,8 @@ class BumpService:
                 return False
                 
             # Get existing additional accounts
-            additional_accounts = campaign.get('additional_accounts', '[]')
-            try:
-                additional_accounts_data = json.loads(additional_accounts) if isinstance(additional_accounts, str) else (additional_accounts or [])
-            except (json.JSONDecodeError, TypeError):
+            additional_accounts_data = _maybe_json(campaign.get('additional_accounts'), [])
+            if not isinstance(additional_accounts_data, list):
                 additional_accounts_data = []
             
             # Check if account already exists
@@ -3623,7 +3821,7 @@ class BumpService:
             additional_accounts_data.append(new_account_config)
             
             # Update campaign
-            self.update_campaign(campaign_id, additional_accounts=json.dumps(additional_accounts_data))
+            self.update_campaign(campaign_id, additional_accounts=_json_dumps(additional_accounts_data))
             
             logger.info(f"✅ Added account {account_id} to campaign {campaign_id} with {delay_minutes}m delay")
             return True
@@ -3641,10 +3839,8 @@ class BumpService:
                 return False
                 
             # Get existing variations
-            content_variations = campaign.get('content_variations', '[]')
-            try:
-                variations_data = json.loads(content_variations) if isinstance(content_variations, str) else (content_variations or [])
-            except (json.JSONDecodeError, TypeError):
+            variations_data = _maybe_json(campaign.get('content_variations'), [])
+            if not isinstance(variations_data, list):
                 variations_data = []
             
             # Add new variation
@@ -3656,7 +3852,7 @@ class BumpService:
             variations_data.append(new_variation)
             
             # Update campaign
-            self.update_campaign(campaign_id, content_variations=json.dumps(variations_data))
+            self.update_campaign(campaign_id, content_variations=_json_dumps(variations_data))
             
             logger.info(f"✅ Added content variation '{new_variation['name']}' to campaign {campaign_id}")
             return True
@@ -3686,11 +3882,10 @@ class BumpService:
         """Close all connections"""
         self.stop_scheduler()
         
-        for account_id, client in self.telegram_clients.items():
-            try:
-                await client.disconnect()
-                logger.info(f"Disconnected bump service client for account {account_id}")
-            except Exception as e:
-                logger.error(f"Error disconnecting client {account_id}: {e}")
+        if self.telegram_clients and self._client_loop is not None:
+            future = asyncio.run_coroutine_threadsafe(
+                self._disconnect_clients(list(self.telegram_clients)), self._client_loop
+            )
+            await asyncio.wrap_future(future)
         
         self.telegram_clients.clear()
@@ -71,7 +71,7 @@ class Config:
     EXECUTION_WORKER_THREADS = int(os.getenv('EXECUTION_WORKER_THREADS', 5))  # Worker threads
     
     # Client Memory Management
-    CLIENT_IDLE_TIMEOUT = int(os.getenv('CLIENT_IDLE_TIMEOUT', 300))  # Close clients idle for 5 min
+    CLIENT_IDLE_TIMEOUT = int(os.getenv('CLIENT_IDLE_TIMEOUT', 7200))  # Close clients idle for 2h (outlives campaign cooldown)
     CLIENT_CLEANUP_INTERVAL = int(os.getenv('CLIENT_CLEANUP_INTERVAL', 60))  # Check every 1 min
     ENABLE_CLIENT_CLEANUP = os.getenv('ENABLE_CLIENT_CLEANUP', 'true').lower() == 'true'
     
@@ -88,6 +88,14 @@ class Config:
     DB_CONNECTION_POOL_SIZE = int(os.getenv('DB_CONNECTION_POOL_SIZE', 10))
     DB_MAX_RETRIES = int(os.getenv('DB_MAX_RETRIES', 5))
     DB_RETRY_DELAY = float(os.getenv('DB_RETRY_DELAY', 1.0))
+    PERFORMANCE_FLUSH_BATCH_SIZE = int(os.getenv('PERFORMANCE_FLUSH_BATCH_SIZE', 25))  # ad_performance rows per batched write
+    MESSAGE_LOG_RETENTION_DAYS = int(os.getenv('MESSAGE_LOG_RETENTION_DAYS', 30))  # Prune older message_logs on startup (0 = keep all)
+    
+    # Campaign Lookup Caches
+    STORAGE_MESSAGE_CACHE_TTL_SECONDS = int(os.getenv('STORAGE_MESSAGE_CACHE_TTL_SECONDS', 300))  # Reuse fetched storage posts for 5 min
+    ACCOUNT_CACHE_TTL_SECONDS = int(os.getenv('ACCOUNT_CACHE_TTL_SECONDS', 60))  # Reuse account rows across campaign runs for 1 min
+    ENTITY_CACHE_TTL_SECONDS = int(os.getenv('ENTITY_CACHE_TTL_SECONDS', 3600))  # Re-resolve chats hourly so renamed/re-created chats are picked up
+    TARGET_DIALOG_SWEEP_MIN = int(os.getenv('TARGET_DIALOG_SWEEP_MIN', 5))  # Prefetch dialogs only for campaigns with at least this many targets
     
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     # 🛡️ ANTI-BAN SYSTEM - Telegram Account Protection
@@ -20,9 +20,128 @@ Version: 1.0.0
 import sqlite3
 import json
 import os
+import threading
 from typing import Dict, List, Optional
 from config import Config
 
+# JSON helpers shared with bump_service: orjson when installed, stdlib json otherwise.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so existing handlers keep working.
+try:
+    import orjson
+    
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# Core schema, applied in one transaction by init_database
+_SCHEMA_SQL = '''
+BEGIN;
+
+-- Users table
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    is_active BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Telegram accounts
+CREATE TABLE IF NOT EXISTS telegram_accounts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    account_name TEXT,
+    phone_number TEXT,
+    api_id TEXT,
+    api_hash TEXT,
+    session_string TEXT,
+    is_active BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (user_id)
+);
+
+-- Forwarding configurations
+CREATE TABLE IF NOT EXISTS forwarding_configs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    account_id INTEGER,
+    source_chat_id TEXT,
+    destination_chat_id TEXT,
+    config_name TEXT,
+    config_data TEXT,
+    is_active BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (user_id),
+    FOREIGN KEY (account_id) REFERENCES telegram_accounts (id)
+);
+
+-- Message logs
+CREATE TABLE IF NOT EXISTS message_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    account_id INTEGER,
+    source_message_id INTEGER,
+    destination_message_id INTEGER,
+    source_chat_id TEXT,
+    destination_chat_id TEXT,
+    forwarded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (user_id),
+    FOREIGN KEY (account_id) REFERENCES telegram_accounts (id)
+);
+
+-- Indexes for the per-user account/config lists, per-account config lookups and per-user logs
+CREATE INDEX IF NOT EXISTS idx_accounts_user ON telegram_accounts(user_id, is_active, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_configs_user ON forwarding_configs(user_id, is_active, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_configs_account ON forwarding_configs(account_id, is_active);
+CREATE INDEX IF NOT EXISTS idx_logs_user_time ON message_logs(user_id, forwarded_at DESC);
+
+COMMIT;
+'''
+
+# Explicit column lists: reads stay stable if columns are added, and listings skip session blobs
+_USER_COLUMNS = 'user_id, username, first_name, last_name, is_active, created_at'
+_ACCOUNT_COLUMNS = 'id, user_id, account_name, phone_number, api_id, api_hash, session_string, is_active, created_at'
+_ACCOUNT_SUMMARY_COLUMNS = 'id, user_id, account_name, phone_number, api_id, is_active, created_at'
+_CONFIG_COLUMNS = (
+    'fc.id, fc.user_id, fc.account_id, fc.source_chat_id, fc.destination_chat_id, '
+    'fc.config_name, fc.config_data, fc.is_active, fc.created_at, ta.account_name'
+)
+
+# Hot write statements, kept as constants so the connection statement cache reuses them
+_UPSERT_USER_SQL = '''
+    INSERT OR REPLACE INTO users (user_id, username, first_name, last_name)
+    VALUES (?, ?, ?, ?)
+'''
+_UPDATE_ACCOUNT_SESSION_SQL = 'UPDATE telegram_accounts SET session_string = ? WHERE id = ?'
+_INSERT_CONFIG_SQL = '''
+    INSERT INTO forwarding_configs
+    (user_id, account_id, source_chat_id, destination_chat_id, config_name, config_data)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+_UPDATE_CONFIG_SQL = 'UPDATE forwarding_configs SET config_data = ? WHERE id = ?'
+_GET_CONFIG_SQL = f'''
+    SELECT {_CONFIG_COLUMNS}
+    FROM forwarding_configs fc
+    LEFT JOIN telegram_accounts ta ON fc.account_id = ta.id
+    WHERE fc.id = ? AND fc.is_active = 1
+'''
+_LOG_MESSAGE_SQL = '''
+    INSERT INTO message_logs
+    (user_id, account_id, source_message_id, destination_message_id, source_chat_id, destination_chat_id)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+def _row_to_config(row: sqlite3.Row) -> Dict:
+    """Convert a _CONFIG_COLUMNS row into a forwarding config dict"""
+    config = dict(row)
+    config['config_data'] = _json_loads(config['config_data'])
+    return config
+
 class Database:
     def __init__(self, db_path: str = None):
         # Use persistent disk if available, otherwise local storage
@@ -35,6 +154,9 @@ class Database:
         else:
             self.db_path = db_path
         
+        # One long-lived connection per thread (scheduler, workers, client loop, bot)
+        self._local = threading.local()
+        
         # Ensure directory exists (only if path contains directory)
         db_dir = os.path.dirname(self.db_path)
         if db_dir:
@@ -42,119 +164,65 @@ class Database:
         self.init_database()
     
     def _get_connection(self):
-        """Get database connection with proper configuration"""
+        """Get this thread's database connection, opening and configuring it on first use
+        
+        Connections are reused, so callers must not close them.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.row_factory = None  # Callers may have switched to sqlite3.Row
+            return conn
         conn = sqlite3.connect(
             self.db_path,
             timeout=30.0,
             check_same_thread=False,
-            isolation_level=None
+            isolation_level=None,
+            cached_statements=256  # Pooled connections keep hot statements compiled
         )
         # Enable WAL mode for better concurrent access
         conn.execute('PRAGMA journal_mode=WAL')
         # Set busy timeout to handle locks better
         conn.execute('PRAGMA busy_timeout=30000')
+        # Per-connection tuning: WAL is crash-safe with NORMAL sync, 20MB page cache, temp tables in RAM
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=-20000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')  # Memory-map up to 256MB of the DB file for reads
+        self._local.conn = conn
+        return conn
+    
+    def _get_row_connection(self):
+        """Get this thread's connection with sqlite3.Row results (reset on the next hand-out)"""
+        conn = self._get_connection()
+        conn.row_factory = sqlite3.Row
         return conn
     
     def init_database(self):
         """Initialize database tables with WAL mode for better concurrency"""
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Enable WAL mode for better concurrency
-            cursor.execute("PRAGMA journal_mode=WAL")
-            cursor.execute("PRAGMA synchronous=NORMAL")
-            cursor.execute("PRAGMA cache_size=10000")
-            cursor.execute("PRAGMA temp_store=MEMORY")
-            
-            # Users table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id INTEGER PRIMARY KEY,
-                    username TEXT,
-                    first_name TEXT,
-                    last_name TEXT,
-                    is_active BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Telegram accounts
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS telegram_accounts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    account_name TEXT,
-                    phone_number TEXT,
-                    api_id TEXT,
-                    api_hash TEXT,
-                    session_string TEXT,
-                    is_active BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (user_id)
-                )
-            ''')
-            
-            # Forwarding configurations
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS forwarding_configs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    account_id INTEGER,
-                    source_chat_id TEXT,
-                    destination_chat_id TEXT,
-                    config_name TEXT,
-                    config_data TEXT,
-                    is_active BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (user_id),
-                    FOREIGN KEY (account_id) REFERENCES telegram_accounts (id)
-                )
-            ''')
-            
-            # Message logs
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS message_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    account_id INTEGER,
-                    source_message_id INTEGER,
-                    destination_message_id INTEGER,
-                    source_chat_id TEXT,
-                    destination_chat_id TEXT,
-                    forwarded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (user_id),
-                    FOREIGN KEY (account_id) REFERENCES telegram_accounts (id)
-                )
-            ''')
+            # WAL + connection PRAGMAs are applied in _get_connection; the schema is created atomically
+            conn.executescript(_SCHEMA_SQL)
+    
+    def run_maintenance(self):
+        """Prune old message logs and refresh planner statistics (once per process, at startup)"""
+        with self._get_connection() as conn:
+            # Keep message_logs bounded so its pages stay in the cache/mmap window
+            self.prune_message_logs(Config.MESSAGE_LOG_RETENTION_DAYS)
             
-            conn.commit()
+            # Refresh planner statistics; analysis_limit keeps this cheap on large tables
+            conn.execute('PRAGMA analysis_limit=1000')
+            conn.execute('ANALYZE')
     
     def add_user(self, user_id: int, username: str = None, first_name: str = None, last_name: str = None):
         """Add or update user"""
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO users (user_id, username, first_name, last_name)
-                VALUES (?, ?, ?, ?)
-            ''', (user_id, username, first_name, last_name))
-            conn.commit()
+            conn.execute(_UPSERT_USER_SQL, (user_id, username, first_name, last_name))
     
     def get_user(self, user_id: int) -> Optional[Dict]:
         """Get user by ID"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
-            row = cursor.fetchone()
-            if row:
-                return {
-                    'user_id': row[0],
-                    'username': row[1],
-                    'first_name': row[2],
-                    'last_name': row[3],
-                    'is_active': row[4],
-                    'created_at': row[5]
-                }
-            return None
+        with self._get_row_connection() as conn:
+            row = conn.execute(f'SELECT {_USER_COLUMNS} FROM users WHERE user_id = ?', (user_id,)).fetchone()
+            return dict(row) if row else None
     
     def add_telegram_account(self, user_id: int, account_name: str, phone_number: str, 
                            api_id: str, api_hash: str, session_string: str = None) -> int:
@@ -166,77 +234,36 @@ class Database:
                 (user_id, account_name, phone_number, api_id, api_hash, session_string)
                 VALUES (?, ?, ?, ?, ?, ?)
             ''', (user_id, account_name, phone_number, api_id, api_hash, session_string))
-            conn.commit()
             return cursor.lastrowid
     
     def get_user_accounts(self, user_id: int) -> List[Dict]:
-        """Get all Telegram accounts for a user"""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM telegram_accounts 
+        """Get all Telegram accounts for a user, including credentials and session strings"""
+        return self._select_user_accounts(user_id, _ACCOUNT_COLUMNS)
+    
+    def list_user_accounts(self, user_id: int) -> List[Dict]:
+        """Get a user's accounts without api_hash/session_string (for menus and listings)"""
+        return self._select_user_accounts(user_id, _ACCOUNT_SUMMARY_COLUMNS)
+    
+    def _select_user_accounts(self, user_id: int, columns: str) -> List[Dict]:
+        with self._get_row_connection() as conn:
+            cursor = conn.execute(f'''
+                SELECT {columns} FROM telegram_accounts 
                 WHERE user_id = ? AND is_active = 1
                 ORDER BY created_at DESC
             ''', (user_id,))
-            rows = cursor.fetchall()
-            return [{
-                'id': row[0],
-                'user_id': row[1],
-                'account_name': row[2],
-                'phone_number': row[3],
-                'api_id': row[4],
-                'api_hash': row[5],
-                'session_string': row[6],
-                'is_active': row[7],
-                'created_at': row[8]
-            } for row in rows]
+            return [dict(row) for row in cursor.fetchall()]
     
     def get_account(self, account_id: int) -> Optional[Dict]:
-        """Get account by ID with retry logic for database locks"""
-        import time
-        import random
-        
-        max_retries = 5
-        for attempt in range(max_retries):
-            try:
-                with self._get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute('SELECT * FROM telegram_accounts WHERE id = ?', (account_id,))
-                    row = cursor.fetchone()
-                    if row:
-                        return {
-                            'id': row[0],
-                            'user_id': row[1],
-                            'account_name': row[2],
-                            'phone_number': row[3],
-                            'api_id': row[4],
-                            'api_hash': row[5],
-                            'session_string': row[6],
-                            'is_active': row[7],
-                            'created_at': row[8]
-                        }
-                    return None
-            except sqlite3.OperationalError as e:
-                if "database is locked" in str(e) and attempt < max_retries - 1:
-                    # Wait with exponential backoff + jitter
-                    wait_time = (2 ** attempt) + random.uniform(0.1, 0.5)
-                    print(f"Database locked, retrying in {wait_time:.2f}s (attempt {attempt + 1}/{max_retries})")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise
-        return None
+        """Get account by ID (lock waits are handled by the connection's busy_timeout)"""
+        with self._get_row_connection() as conn:
+            row = conn.execute(f'SELECT {_ACCOUNT_COLUMNS} FROM telegram_accounts WHERE id = ?',
+                               (account_id,)).fetchone()
+            return dict(row) if row else None
     
     def update_account_session(self, account_id: int, session_string: str):
         """Update account session string"""
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE telegram_accounts 
-                SET session_string = ?
-                WHERE id = ?
-            ''', (session_string, account_id))
-            conn.commit()
+            conn.execute(_UPDATE_ACCOUNT_SESSION_SQL, (session_string, account_id))
     
     def delete_account(self, account_id: int):
         """Delete Telegram account and clean up all related data"""
@@ -247,20 +274,25 @@ class Database:
             cursor.execute('SELECT account_name, phone_number FROM telegram_accounts WHERE id = ?', (account_id,))
             account_info = cursor.fetchone()
             
-            # Completely remove the account record (not just deactivate)
-            cursor.execute('DELETE FROM telegram_accounts WHERE id = ?', (account_id,))
-            
-            # Also clean up related data
-            # Delete any forwarding configs using this account
-            cursor.execute('DELETE FROM forwarding_configs WHERE account_id = ?', (account_id,))
-            
-            # Delete any campaigns using this account
-            cursor.execute('DELETE FROM ad_campaigns WHERE account_id = ?', (account_id,))
-            
-            # Delete any message logs for this account
-            cursor.execute('DELETE FROM message_logs WHERE account_id = ?', (account_id,))
-            
-            conn.commit()
+            # All deletes in one write transaction (autocommit would commit each separately)
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                # Completely remove the account record (not just deactivate)
+                cursor.execute('DELETE FROM telegram_accounts WHERE id = ?', (account_id,))
+                
+                # Also clean up related data
+                # Delete any forwarding configs using this account
+                cursor.execute('DELETE FROM forwarding_configs WHERE account_id = ?', (account_id,))
+                
+                # Delete any campaigns using this account
+                cursor.execute('DELETE FROM ad_campaigns WHERE account_id = ?', (account_id,))
+                
+                # Delete any message logs for this account
+                cursor.execute('DELETE FROM message_logs WHERE account_id = ?', (account_id,))
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
             
             if account_info:
                 print(f"✅ Completely deleted account '{account_info[0]}' ({account_info[1]}) and all related data")
@@ -271,78 +303,67 @@ class Database:
                             destination_chat_id: str, config_name: str, config_data: Dict) -> int:
         """Add forwarding configuration"""
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO forwarding_configs 
-                (user_id, account_id, source_chat_id, destination_chat_id, config_name, config_data)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (user_id, account_id, source_chat_id, destination_chat_id, config_name, json.dumps(config_data)))
-            conn.commit()
+            cursor = conn.execute(_INSERT_CONFIG_SQL, (user_id, account_id, source_chat_id, destination_chat_id,
+                                                       config_name, _json_dumps(config_data)))
             return cursor.lastrowid
     
     def get_user_configs(self, user_id: int, account_id: int = None) -> List[Dict]:
         """Get all forwarding configurations for a user"""
-        with self._get_connection() as conn:
+        with self._get_row_connection() as conn:
             cursor = conn.cursor()
             if account_id:
-                cursor.execute('''
-                    SELECT fc.*, ta.account_name 
+                cursor.execute(f'''
+                    SELECT {_CONFIG_COLUMNS}
                     FROM forwarding_configs fc
                     LEFT JOIN telegram_accounts ta ON fc.account_id = ta.id
                     WHERE fc.user_id = ? AND fc.account_id = ? AND fc.is_active = 1
                     ORDER BY fc.created_at DESC
                 ''', (user_id, account_id))
             else:
-                cursor.execute('''
-                    SELECT fc.*, ta.account_name 
+                cursor.execute(f'''
+                    SELECT {_CONFIG_COLUMNS}
                     FROM forwarding_configs fc
                     LEFT JOIN telegram_accounts ta ON fc.account_id = ta.id
                     WHERE fc.user_id = ? AND fc.is_active = 1
                     ORDER BY fc.created_at DESC
                 ''', (user_id,))
             rows = cursor.fetchall()
-            return [{
-                'id': row[0],
-                'user_id': row[1],
-                'account_id': row[2],
-                'source_chat_id': row[3],
-                'destination_chat_id': row[4],
-                'config_name': row[5],
-                'config_data': json.loads(row[6]),
-                'is_active': row[7],
-                'created_at': row[8],
-                'account_name': row[9]
-            } for row in rows]
+            return [_row_to_config(row) for row in rows]
+    
+    def get_config(self, config_id: int) -> Optional[Dict]:
+        """Get a single active forwarding configuration by ID"""
+        with self._get_row_connection() as conn:
+            row = conn.execute(_GET_CONFIG_SQL, (config_id,)).fetchone()
+            return _row_to_config(row) if row else None
     
     def update_config(self, config_id: int, config_data: Dict):
         """Update forwarding configuration"""
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE forwarding_configs 
-                SET config_data = ?
-                WHERE id = ?
-            ''', (json.dumps(config_data), config_id))
-            conn.commit()
+            conn.execute(_UPDATE_CONFIG_SQL, (_json_dumps(config_data), config_id))
     
     def delete_config(self, config_id: int):
         """Delete forwarding configuration"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('UPDATE forwarding_configs SET is_active = 0 WHERE id = ?', (config_id,))
-            conn.commit()
+    
+    def prune_message_logs(self, retention_days: int) -> int:
+        """Delete message logs older than retention_days (0 disables); returns the number removed"""
+        if retention_days <= 0:
+            return 0
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM message_logs WHERE forwarded_at < datetime('now', ?)",
+                (f'-{retention_days} days',)
+            )
+            return cursor.rowcount
     
     def log_message(self, user_id: int, account_id: int, source_message_id: int, 
                    destination_message_id: int, source_chat_id: str, destination_chat_id: str):
         """Log forwarded message"""
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO message_logs 
-                (user_id, account_id, source_message_id, destination_message_id, source_chat_id, destination_chat_id)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (user_id, account_id, source_message_id, destination_message_id, source_chat_id, destination_chat_id))
-            conn.commit()
+            conn.execute(_LOG_MESSAGE_SQL, (user_id, account_id, source_message_id, destination_message_id,
+                                            source_chat_id, destination_chat_id))
     
     def get_campaign(self, campaign_id: int) -> Optional[Dict]:
         """Get a campaign by ID"""
@@ -363,19 +384,19 @@ class Database:
                 # Parse JSON fields
                 if campaign.get('ad_content'):
                     try:
-                        campaign['ad_content'] = json.loads(campaign['ad_content'])
+                        campaign['ad_content'] = _json_loads(campaign['ad_content'])
                     except json.JSONDecodeError:
                         campaign['ad_content'] = {}
                 
                 if campaign.get('target_chats'):
                     try:
-                        campaign['target_chats'] = json.loads(campaign['target_chats'])
+                        campaign['target_chats'] = _json_loads(campaign['target_chats'])
                     except json.JSONDecodeError:
                         campaign['target_chats'] = []
                 
                 if campaign.get('buttons'):
                     try:
-                        campaign['buttons'] = json.loads(campaign['buttons'])
+                        campaign['buttons'] = _json_loads(campaign['buttons'])
                     except json.JSONDecodeError:
                         campaign['buttons'] = []
                 
@@ -392,11 +413,9 @@ class Database:
                     total_sends = total_sends + 1
                 WHERE id = ?
             ''', (campaign_id,))
-            conn.commit()
     
     def update_campaign_storage_message_id(self, campaign_id: int, new_storage_message_id: int):
         """Update the storage message ID in a campaign's ad_content"""
-        import json
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
@@ -412,13 +431,13 @@ class Database:
             
             try:
                 # Parse the JSON
-                ad_content = json.loads(ad_content_str)
+                ad_content = _json_loads(ad_content_str)
                 
                 # Update the storage_message_id
                 ad_content['storage_message_id'] = new_storage_message_id
                 
                 # Convert back to JSON
-                updated_ad_content_str = json.dumps(ad_content)
+                updated_ad_content_str = _json_dumps(ad_content)
                 
                 # Update the database
                 cursor.execute('''
@@ -426,7 +445,6 @@ class Database:
                     SET ad_content = ?
                     WHERE id = ?
                 ''', (updated_ad_content_str, campaign_id))
-                conn.commit()
                 
                 return True
             except (json.JSONDecodeError, KeyError) as e:
@@ -1,20 +1,27 @@
 #!/usr/bin/env python3
 import asyncio
+import atexit
 import logging
+import logging.handlers
+import queue
 import signal
 import sys
 from bot import TgcfBot
 from config import Config
 
-# Configure logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO,
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('tgcf.log')
-    ]
-)
+# Configure logging: callers only enqueue records, a listener thread does the stdout/file writes
+# (force=True because importing bot already installed a basic stdout handler)
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [logging.StreamHandler(sys.stdout), logging.FileHandler('tgcf.log')]
+for log_handler in log_handlers:
+    log_handler.setFormatter(log_formatter)
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued records on exit
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))  # Full formatting happens in the listener
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler], force=True)
 
 logger = logging.getLogger(__name__)
 
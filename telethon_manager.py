@@ -4,21 +4,55 @@ Handles both storage creation and message forwarding with proper session managem
 """
 
 import asyncio
+import base64
+import functools
 import logging
 import os
 import time
+import weakref
 from typing import Optional, Dict, Any, List
 from telethon import TelegramClient
-from telethon.tl.types import MessageEntityCustomEmoji, MessageEntityBold, MessageEntityItalic, MessageEntityMention
+from telethon.tl.types import (
+    MessageEntityCustomEmoji, MessageEntityBold, MessageEntityItalic,
+    MessageEntityTextUrl, MessageEntityHashtag, MessageEntityMention
+)
 from telethon.errors import SessionPasswordNeededError, PhoneCodeInvalidError, FloodWaitError
+from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Bot API entity type -> builder(offset, length, custom_emoji_id, url); shared with
+# bump_service. Unlisted types are skipped, and a builder returning None means "skip"
+_ENTITY_CTORS = {
+    # custom_emoji is the key for premium emojis!
+    'custom_emoji': lambda offset, length, emoji_id, url: MessageEntityCustomEmoji(
+        offset=offset, length=length, document_id=int(emoji_id)) if emoji_id else None,
+    'bold': lambda offset, length, emoji_id, url: MessageEntityBold(offset=offset, length=length),
+    'italic': lambda offset, length, emoji_id, url: MessageEntityItalic(offset=offset, length=length),
+    'text_link': lambda offset, length, emoji_id, url: MessageEntityTextUrl(
+        offset=offset, length=length, url=url) if url else None,
+    'hashtag': lambda offset, length, emoji_id, url: MessageEntityHashtag(offset=offset, length=length),
+    'mention': lambda offset, length, emoji_id, url: MessageEntityMention(offset=offset, length=length),
+}
+
+@functools.lru_cache(maxsize=64)
+def _normalize_entity_type(entity_type) -> str:
+    """Map Bot API entity type enums to their plain string name"""
+    if hasattr(entity_type, 'value'):
+        return entity_type.value
+    if hasattr(entity_type, 'name'):
+        return entity_type.name.lower()
+    return entity_type
+
 class TelethonManager:
     """Unified Telethon client manager for storage and forwarding operations"""
     
     def __init__(self):
         self.clients: Dict[str, TelegramClient] = {}
+        self._decoded_sessions: Dict[tuple, tuple] = {}  # (account_id, field) -> (encoded value, session bytes)
+        self._validated_at: Dict[str, float] = {}  # account_id -> last successful authorization check
+        # client -> {chat_id: (cached_at, entity)}; entities carry per-account access hashes, so cache per client
+        self._entity_cache = weakref.WeakKeyDictionary()
         # Use persistent disk if available, otherwise local directory
         if os.path.exists('/data'):
             self.session_dir = "/data/sessions"
@@ -26,6 +60,44 @@ class TelethonManager:
             self.session_dir = "sessions"
         os.makedirs(self.session_dir, exist_ok=True)
     
+    @staticmethod
+    def _write_session_file(session_path: str, session_data: bytes):
+        """Atomically write a decoded session file (owner-only permissions)"""
+        tmp_path = f"{session_path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            view = memoryview(session_data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, session_path)
+    
+    def _decode_session(self, account_id: str, field: str, encoded: str) -> bytes:
+        """base64-decode stored session data, reusing the result while the stored value is unchanged"""
+        cached = self._decoded_sessions.get((account_id, field))
+        if cached and cached[0] == encoded:
+            return cached[1]
+        session_data = base64.b64decode(encoded)
+        self._decoded_sessions[(account_id, field)] = (encoded, session_data)
+        return session_data
+    
+    def invalidate_account(self, account_id):
+        """Drop the cached client and decoded session bytes after the account is changed or deleted"""
+        account_id = str(account_id)
+        self._decoded_sessions.pop((account_id, 'session_string'), None)
+        self._decoded_sessions.pop((account_id, 'session_data'), None)
+        self._validated_at.pop(account_id, None)
+        client = self.clients.pop(account_id, None)
+        if client is None:
+            return
+        # Callable from any thread: the disconnect runs on the loop the client is bound to
+        loop = getattr(client, '_loop', None)
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.disconnect(), loop)
+        else:
+            logger.warning(f"⚠️ Client loop for account {account_id} is not running; dropped without disconnect")
+    
     async def get_client(self, account_data: Dict[str, Any]) -> Optional[TelegramClient]:
         """Get or create a Telethon client for the given account with improved error handling"""
         account_id = str(account_data['id'])
@@ -33,11 +105,19 @@ class TelethonManager:
         # Check if existing client is still valid
         if account_id in self.clients:
             client = self.clients[account_id]
+            # Fast path: connected and authorized recently - skip the is_user_authorized/get_me round-trips.
+            # Only valid on the loop the client was connected on (the bot loop and the bump service's
+            # client loop share this map); otherwise the check below fails and the client is rebuilt.
+            if (client.is_connected() and
+                    getattr(client, '_loop', None) is asyncio.get_running_loop() and
+                    time.time() - self._validated_at.get(account_id, 0) < Config.SESSION_VALIDATION_INTERVAL):
+                return client
             try:
                 # Test if client is still authorized and connected
                 if client.is_connected() and await client.is_user_authorized():
                     # Test with a simple API call to ensure it's working
                     await client.get_me()
+                    self._validated_at[account_id] = time.time()
                     logger.info(f"✅ Existing client for account {account_id} is valid and authorized")
                     return client
                 else:
@@ -80,15 +160,14 @@ class TelethonManager:
                     if session_str.startswith('U1FMaXRlIGZvcm1hdCAz') or len(session_str) > 1000:
                         logger.info(f"🔄 Detected base64 session data for account {account_id}, converting to session file")
                         # This is base64 encoded session data, not a StringSession string
-                        import base64
                         session_name = f"unified_{account_id}"
                         session_path = os.path.join(self.session_dir, f"{session_name}.session")
                         
                         # Decode and write session data to file
                         try:
-                            session_data = base64.b64decode(session_str)
-                            with open(session_path, 'wb') as f:
-                                f.write(session_data)
+                            session_data = self._decode_session(account_id, 'session_string', session_str)
+                            await asyncio.get_running_loop().run_in_executor(
+                                None, self._write_session_file, session_path, session_data)
                             
                             # Use session file instead of StringSession
                             client = TelegramClient(
@@ -123,15 +202,14 @@ class TelethonManager:
             if not account_data.get('session_string') or 'session_error' in locals():
                 if account_data.get('session_data'):
                     # Use existing session file
-                    import base64
                     session_name = f"unified_{account_id}"
                     session_path = os.path.join(self.session_dir, f"{session_name}.session")
                     
                     # Write session data to file
                     try:
-                        session_data = base64.b64decode(account_data['session_data'])
-                        with open(session_path, 'wb') as f:
-                            f.write(session_data)
+                        session_data = self._decode_session(account_id, 'session_data', account_data['session_data'])
+                        await asyncio.get_running_loop().run_in_executor(
+                            None, self._write_session_file, session_path, session_data)
                         
                         client = TelegramClient(
                             session_path.replace('.session', ''),
@@ -177,6 +255,7 @@ class TelethonManager:
             
             # Store client for reuse
             self.clients[account_id] = client
+            self._validated_at[account_id] = time.time()
             logger.info(f"✅ Created unified Telethon client for account {account_data['account_name']}")
             
             return client
@@ -185,6 +264,16 @@ class TelethonManager:
             logger.error(f"❌ Failed to create Telethon client for account {account_id}: {e}")
             return None
     
+    async def _get_entity_cached(self, client: TelegramClient, chat_id):
+        """Resolve chat_id once per client per TTL; later lookups skip the get_entity round-trip"""
+        entities = self._entity_cache.setdefault(client, {})
+        cached = entities.get(chat_id)
+        if cached and time.time() - cached[0] < Config.ENTITY_CACHE_TTL_SECONDS:
+            return cached[1]
+        entity = await client.get_entity(chat_id)
+        entities[chat_id] = (time.time(), entity)
+        return entity
+    
     async def create_storage_message(self, account_data: Dict[str, Any], storage_channel_id: int, 
                                    media_data: Dict[str, Any], bot_instance=None) -> Optional[Dict[str, Any]]:
         """Create a storage message using Telethon with proper custom emoji handling"""
@@ -200,7 +289,7 @@ class TelethonManager:
             # This preserves all entities and custom emojis perfectly
             if media_data.get('original_message_id') and media_data.get('original_chat_id'):
                 # Forward the original message to storage channel
-                original_chat = await client.get_entity(media_data['original_chat_id'])
+                original_chat = await self._get_entity_cached(client, media_data['original_chat_id'])
                 sent_message = await client.forward_messages(
                     entity=storage_channel_id,
                     messages=media_data['original_message_id'],
@@ -258,7 +347,7 @@ class TelethonManager:
                 
                 # Get storage channel entity with retry
                 try:
-                    storage_channel = await client.get_entity(storage_channel_id)
+                    storage_channel = await self._get_entity_cached(client, storage_channel_id)
                 except Exception as entity_error:
                     logger.warning(f"Failed to get storage channel entity: {entity_error}")
                     if attempt < max_retries - 1:
@@ -269,7 +358,7 @@ class TelethonManager:
                 
                 # Get target chat entity with retry
                 try:
-                    target_entity = await client.get_entity(target_chat_id)
+                    target_entity = await self._get_entity_cached(client, target_chat_id)
                 except Exception as target_error:
                     logger.warning(f"Failed to get target entity {target_chat_id}: {target_error}")
                     if attempt < max_retries - 1:
@@ -318,37 +407,14 @@ class TelethonManager:
         
         for entity_data in bot_entities:
             try:
-                entity_type = entity_data['type']
-                if hasattr(entity_type, 'value'):
-                    entity_type = entity_type.value
-                elif hasattr(entity_type, 'name'):
-                    entity_type = entity_type.name.lower()
-                
-                if entity_type == 'custom_emoji':
-                    entity = MessageEntityCustomEmoji(
-                        offset=entity_data['offset'],
-                        length=entity_data['length'],
-                        document_id=int(entity_data['custom_emoji_id'])
-                    )
-                elif entity_type == 'bold':
-                    entity = MessageEntityBold(
-                        offset=entity_data['offset'],
-                        length=entity_data['length']
-                    )
-                elif entity_type == 'italic':
-                    entity = MessageEntityItalic(
-                        offset=entity_data['offset'],
-                        length=entity_data['length']
-                    )
-                elif entity_type == 'mention':
-                    entity = MessageEntityMention(
-                        offset=entity_data['offset'],
-                        length=entity_data['length']
-                    )
-                else:
+                ctor = _ENTITY_CTORS.get(_normalize_entity_type(entity_data['type']))
+                if ctor is None:
                     continue
                 
-                telethon_entities.append(entity)
+                entity = ctor(entity_data['offset'], entity_data['length'],
+                              entity_data.get('custom_emoji_id'), entity_data.get('url'))
+                if entity is not None:
+                    telethon_entities.append(entity)
                 
             except Exception as e:
                 logger.warning(f"Failed to convert entity: {e}")
@@ -418,6 +484,8 @@ class TelethonManager:
             except:
                 pass
         self.clients.clear()
+        self._validated_at.clear()
+        self._decoded_sessions.clear()
 
 # Global instance
 telethon_manager = TelethonManager()
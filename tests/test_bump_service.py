@@ -0,0 +1,164 @@
+"""Tests for the pure helpers in bump_service"""
+
+import asyncio
+import weakref
+
+import pytest
+
+pytest.importorskip("telethon")
+pytest.importorskip("schedule")
+
+import bump_service
+
+
+def test_bracket_prefixed_plain_text_ad_is_kept():
+    ad_content, target_chats, buttons, target_mode = bump_service._parse_campaign_blob(
+        "[SALE] Buy now!", "{not json", "[broken", None
+    )
+    assert ad_content == "[SALE] Buy now!"
+    assert target_chats == ["{not json"]
+    assert buttons == []
+    assert target_mode == "specific"
+
+
+def test_json_columns_are_decoded():
+    ad_content, target_chats, buttons, _ = bump_service._parse_campaign_blob(
+        '{"type": "forwarded"}', '["@group"]', '[{"text": "Go", "url": "https://t.me/x"}]', "all_groups"
+    )
+    assert ad_content == {"type": "forwarded"}
+    assert target_chats == ["@group"]
+    assert buttons == [{"text": "Go", "url": "https://t.me/x"}]
+
+
+def test_maybe_json_plain_and_empty_values():
+    assert bump_service._maybe_json("hello", "") == "hello"
+    assert bump_service._maybe_json("", []) == []
+    assert bump_service._maybe_json(None, []) == []
+    assert bump_service._maybe_json("[oops", []) == "[oops"
+
+
+@pytest.mark.parametrize("schedule_time, expected", [
+    ("every hour", bump_service.ScheduleTrigger('hours', 1)),
+    ("3 hours", bump_service.ScheduleTrigger('hours', 3)),
+    ("every 4 hours", bump_service.ScheduleTrigger('hours', 4)),
+    ("2 hours 30 minutes", bump_service.ScheduleTrigger('hours', 2)),
+    ("every 3 minutes", bump_service.ScheduleTrigger('minutes', 3)),
+    ("every minute", bump_service.ScheduleTrigger('minutes', 10)),
+    ("15", bump_service.ScheduleTrigger('minutes', 15)),
+])
+def test_custom_schedule_intervals(schedule_time, expected):
+    assert bump_service._compile_schedule('custom', schedule_time) == expected
+
+
+def test_unknown_custom_schedule_is_not_compiled():
+    assert bump_service._compile_schedule('custom', 'whenever') is None
+
+
+class _IdleClient:
+    def __init__(self):
+        self.disconnected = False
+
+    def is_connected(self):
+        return not self.disconnected
+
+    async def disconnect(self):
+        self.disconnected = True
+
+
+def _bare_service():
+    service = bump_service.BumpService.__new__(bump_service.BumpService)
+    service.telegram_clients = {}
+    service.client_last_used = {}
+    service.client_cleanup_interval = 60
+    service._client_locks = bump_service.defaultdict(asyncio.Lock)
+    service._client_holders = bump_service.defaultdict(weakref.WeakSet)
+    return service
+
+
+def test_idle_cleanup_skips_clients_held_by_a_running_task():
+    service = _bare_service()
+    busy, idle = _IdleClient(), _IdleClient()
+    service.telegram_clients.update({1: busy, 2: idle})
+    service.client_last_used.update({1: 0.0, 2: 0.0})
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def campaign_run():
+            await service._get_client(1)
+            await release.wait()
+
+        run = asyncio.create_task(campaign_run())
+        await asyncio.sleep(0)
+        closed_while_running = await service._close_idle_clients(bump_service.time.time() + 61)
+        release.set()
+        await run
+        closed_after = await service._close_idle_clients(bump_service.time.time() + 61)
+        return closed_while_running, closed_after
+
+    closed_while_running, closed_after = asyncio.run(scenario())
+    assert closed_while_running == [2]
+    assert closed_after == [1]
+    assert busy.disconnected and idle.disconnected
+
+
+class _Entity:
+    def __init__(self, entity_id, username=None):
+        self.id = entity_id
+        self.username = username
+
+
+class _Dialog:
+    def __init__(self, marked_id, entity):
+        self.id = marked_id
+        self.entity = entity
+
+
+class _DialogClient:
+    def __init__(self, dialogs):
+        self.dialogs = dialogs
+        self.sweeps = 0
+        self.lookups = []
+
+    async def get_dialogs(self):
+        self.sweeps += 1
+        return self.dialogs
+
+    async def get_entity(self, chat_id):
+        self.lookups.append(chat_id)
+        return ('looked up', chat_id)
+
+
+def test_target_resolution_sweeps_only_above_threshold():
+    service = _bare_service()
+    service._target_dialog_sweep_min = 3
+    channel = _Entity(123, 'Shop')
+    client = _DialogClient([_Dialog(-100123, channel)])
+
+    resolved = asyncio.run(service._resolve_target_entities(client, ['@shop', -100123]))
+    assert client.sweeps == 0
+    assert resolved == [('looked up', '@shop'), ('looked up', -100123)]
+
+
+def test_target_resolution_matches_marked_ids_and_usernames_only():
+    service = _bare_service()
+    service._target_dialog_sweep_min = 3
+    channel, user = _Entity(123, 'Shop'), _Entity(123)
+    client = _DialogClient([_Dialog(-100123, channel), _Dialog(123, user)])
+
+    resolved = asyncio.run(service._resolve_target_entities(client, ['-100123', '@SHOP', 123, '456']))
+    assert client.sweeps == 1
+    assert resolved == [channel, channel, user, ('looked up', '456')]
+
+
+def test_invalidate_account_clears_per_account_storage_caches():
+    service = _bare_service()
+    service._account_cache = {1: (0.0, {}), 2: (0.0, {})}
+    service._storage_entity_cache = {(1, '-100'): 'a', (2, '-100'): 'b'}
+    service._storage_msg_cache = {(1, 100, 5): (0.0, 'm'), (2, 100, 5): (0.0, 'n')}
+
+    service.invalidate_account(1)
+
+    assert list(service._account_cache) == [2]
+    assert list(service._storage_entity_cache) == [(2, '-100')]
+    assert list(service._storage_msg_cache) == [(2, 100, 5)]
@@ -0,0 +1,111 @@
+"""Tests for TelethonManager's in-memory caches"""
+
+import asyncio
+import base64
+
+import pytest
+
+pytest.importorskip("telethon")
+
+import telethon_manager
+from telethon_manager import TelethonManager
+
+
+def test_decoded_session_is_reused_only_for_the_same_value():
+    manager = TelethonManager()
+    first = base64.b64encode(b"first session").decode()
+    second = base64.b64encode(b"second session").decode()
+
+    assert manager._decode_session("1", "session_data", first) == b"first session"
+    assert manager._decode_session("1", "session_data", first) == b"first session"
+    assert manager._decode_session("1", "session_data", second) == b"second session"
+
+
+def test_invalidate_account_drops_decoded_sessions():
+    manager = TelethonManager()
+    encoded = base64.b64encode(b"session").decode()
+    manager._decode_session("7", "session_string", encoded)
+    manager._decode_session("7", "session_data", encoded)
+    manager._decode_session("8", "session_data", encoded)
+
+    manager.invalidate_account(7)
+
+    assert list(manager._decoded_sessions) == [("8", "session_data")]
+
+
+class _FakeClient:
+    """Minimal stand-in that counts get_entity calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get_entity(self, chat_id):
+        self.calls += 1
+        return (chat_id, self.calls)
+
+
+def test_entity_cache_expires_after_ttl(monkeypatch):
+    manager = TelethonManager()
+    client = _FakeClient()
+    now = [1000.0]
+    monkeypatch.setattr(telethon_manager.time, "time", lambda: now[0])
+
+    assert asyncio.run(manager._get_entity_cached(client, 42)) == (42, 1)
+    assert asyncio.run(manager._get_entity_cached(client, 42)) == (42, 1)
+    now[0] += telethon_manager.Config.ENTITY_CACHE_TTL_SECONDS
+    assert asyncio.run(manager._get_entity_cached(client, 42)) == (42, 2)
+
+
+class _ConnectedClient:
+    """Connected client stand-in whose authorization check fails like a foreign-loop client"""
+
+    def __init__(self, loop):
+        self._loop = loop
+
+    def is_connected(self):
+        return True
+
+    async def is_user_authorized(self):
+        raise RuntimeError("The asyncio event loop must not change after connection")
+
+    async def disconnect(self):
+        pass
+
+
+def test_fast_path_only_returns_clients_bound_to_the_running_loop():
+    manager = TelethonManager()
+
+    async def fetch(bind_to_running_loop):
+        loop = asyncio.get_running_loop() if bind_to_running_loop else object()
+        client = _ConnectedClient(loop)
+        manager.clients["5"] = client
+        manager._validated_at["5"] = telethon_manager.time.time()
+        return client, await manager.get_client({'id': 5})
+
+    client, result = asyncio.run(fetch(True))
+    assert result is client
+
+    client, result = asyncio.run(fetch(False))
+    assert result is not client
+    assert "5" not in manager.clients
+
+
+def test_invalidate_account_disconnects_and_drops_the_cached_client():
+    manager = TelethonManager()
+
+    async def scenario():
+        client = _ConnectedClient(asyncio.get_running_loop())
+        disconnected = asyncio.Event()
+
+        async def disconnect():
+            disconnected.set()
+        client.disconnect = disconnect
+
+        manager.clients["9"] = client
+        manager._validated_at["9"] = 0.0
+        manager.invalidate_account(9)
+        await asyncio.wait_for(disconnected.wait(), timeout=1)
+
+    asyncio.run(scenario())
+    assert "9" not in manager.clients
+    assert "9" not in manager._validated_at